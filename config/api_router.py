@@ -1,14 +1,22 @@
 from django.conf import settings
-from rest_framework.routers import DefaultRouter
 from rest_framework.routers import SimpleRouter
 
+from notablehumans.data_collection.api.views import NotableHumansGeoJSONSeqViewSet
 from notablehumans.data_collection.api.views import NotableHumansGeoJSONViewSet
 from notablehumans.users.api.views import UserViewSet
 
-router = DefaultRouter() if settings.DEBUG else SimpleRouter()
+# DefaultRouter only adds the browsable API root view, which is a development convenience;
+# production workers stick to SimpleRouter and never import it
+if settings.DEBUG:
+    from rest_framework.routers import DefaultRouter
+
+    router = DefaultRouter()
+else:
+    router = SimpleRouter()
 
 router.register("users", UserViewSet)
 router.register("notable-humans-geojson", NotableHumansGeoJSONViewSet, basename="notable-humans-geojson")
+router.register("notable-humans-geojson-seq", NotableHumansGeoJSONSeqViewSet, basename="notable-humans-geojson-seq")
 
 app_name = "api"
 urlpatterns = router.urls
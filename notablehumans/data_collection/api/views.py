@@ -1,23 +1,107 @@
-import json
 from pathlib import Path
 
 from django.conf import settings
+from django.http import FileResponse
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.viewsets import ViewSet
 
+# Pre-compressed copies written by the export, in order of preference: (file suffix, Content-Encoding)
+PRECOMPRESSED_VARIANTS = ((".br", "br"), (".gz", "gzip"))
+
+
+def get_accepted_encodings(accept_encoding):
+    """
+    Content-codings listed in an Accept-Encoding header, leaving out those the client refuses with q=0.
+    """
+    accepted = set()
+    for entry in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in entry.split(";"))
+        qvalue = next((param[2:] for param in params if param.lower().startswith("q=")), "1")
+        try:
+            if float(qvalue) > 0:
+                accepted.add(coding.lower())
+        except ValueError:
+            continue
+    return accepted
+
+
+def get_export_variant(file_path, mtime_ns, accept_encoding):
+    """
+    Pick the best pre-compressed copy written by the export that the client accepts and that is up to date.
+    Returns the path to serve and its Content-Encoding (None for the plain file).
+    """
+    accepted = get_accepted_encodings(accept_encoding)
+    for suffix, content_encoding in PRECOMPRESSED_VARIANTS:
+        if content_encoding not in accepted:
+            continue
+        variant_path = file_path.with_name(f"{file_path.name}{suffix}")
+        try:
+            if variant_path.stat().st_mtime_ns >= mtime_ns:
+                return variant_path, content_encoding
+        except FileNotFoundError:
+            continue
+    return file_path, None
+
+
+class ExportedFileViewSet(ViewSet):
+    """
+    Serves a file written by the export_notablehumans command as-is.
+    """
 
-class NotableHumansGeoJSONViewSet(ViewSet):
     permission_classes = [AllowAny]  # Make this public to your React frontend
+    file_name = None
+    content_type = None
 
     def list(self, request, *args, **kwargs):
         try:
             base_path = Path(settings.BASE_DIR)
-            file_path = base_path / "notablehumans" / "data_collection" / "management" / "notable_humans.geojson"
-            with open(file_path, encoding="utf-8") as f:
-                geojson = json.load(f)
-            return Response(geojson)
+            file_path = base_path / "notablehumans" / "data_collection" / "management" / self.file_name
+            stat = file_path.stat()
+            serve_path, content_encoding = get_export_variant(
+                file_path, stat.st_mtime_ns, request.headers.get("Accept-Encoding", "")
+            )
+
+            # Each encoding is a distinct representation, so it gets its own ETag
+            suffix = f"-{content_encoding}" if content_encoding else ""
+            etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{suffix}"'
+            last_modified = stat.st_mtime_ns // 1_000_000_000
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                # A 304 carries the same validators the 200 would have sent
+                patch_vary_headers(not_modified, ("Accept-Encoding",))
+                not_modified["ETag"] = etag
+                not_modified["Last-Modified"] = http_date(last_modified)
+                return not_modified
+
+            # The export is already serialized, so stream the file as-is (the WSGI server can use sendfile, and
+            # every worker shares the OS page cache) instead of parsing it and letting DRF re-render it
+            response = FileResponse(open(serve_path, "rb"), content_type=self.content_type)  # noqa: SIM115
+            if content_encoding:
+                response["Content-Encoding"] = content_encoding
+            patch_vary_headers(response, ("Accept-Encoding",))
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
         except FileNotFoundError:
             return Response({"error": "GeoJSON file not found."}, status=404)
         except Exception as e:
             return Response({"error": "Failed to load GeoJSON", "details": str(e)}, status=500)
+        else:
+            return response
+
+
+class NotableHumansGeoJSONViewSet(ExportedFileViewSet):
+    file_name = "notable_humans.geojson"
+    content_type = "application/json"
+
+
+class NotableHumansGeoJSONSeqViewSet(ExportedFileViewSet):
+    """
+    One feature per record (RFC 8142 GeoJSON Text Sequence) so clients can render features as they arrive.
+    """
+
+    file_name = "notable_humans.geojsons"
+    content_type = "application/geo+json-seq"
@@ -1,11 +1,163 @@
-import json
-import os
+import gzip
+import multiprocessing
+import shutil
+from collections import defaultdict
+from pathlib import Path
 
+import brotli
 from django.core.management.base import BaseCommand
-from tqdm import tqdm  # 👈 Add this import
-from datetime import datetime
-
-from ...models import NotableHuman
+from django.db import connection
+from django.db import connections
+import orjson
+from tqdm import tqdm
+
+from notablehumans.data_collection.models import NotableHuman
+from notablehumans.data_collection.models import Place
+
+WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB write buffer to keep syscalls down on large exports
+GEOJSON_SEQ_RECORD_SEPARATOR = b"\x1e"  # RFC 8142: each GeoJSON text is prefixed with RS and ends with LF
+# Files are compressed once per export and served many times, so use the slowest, smallest settings
+GZIP_COMPRESS_LEVEL = 9
+BROTLI_QUALITY = 11
+EXPORT_CHUNK_SIZE = 5000  # Humans per keyset shard (one query for the humans, one for their attributes)
+EXPORT_WORKERS = 4  # Each forked worker holds its own Postgres connection, so keep this well under max_connections
+
+# Exported column (SQL expression, in SELECT order) -> short property key used in the exported GeoJSON
+FIELD_TO_SHORT = {
+    "h.wikidata_id": "id",
+    "h.wikipedia_url": "wu",
+    "h.name": "n",
+    "h.description": "d",
+    "h.birth_year": "by",
+    "h.birth_date": "bd",
+    "bp.name": "bp",
+    "h.death_year": "dy",
+    "h.death_date": "dd",
+    "dp.name": "dp",
+    "h.article_created_date": "cd",
+    "h.article_length": "al",
+    "h.article_recent_views": "rv",
+    "h.article_total_edits": "te",
+    "h.article_recent_edits": "re",
+}
+SHORT_KEYS = tuple(FIELD_TO_SHORT.values())
+# Row layout: the mapped properties, then birth place longitude and latitude (rounded to 3 places by the database;
+# Postgres only rounds numerics to a scale, hence the casts), then whether any attributes exist
+PROPERTY_COUNT = len(SHORT_KEYS)
+
+# Plain SQL for the read path: avoids the ORM's per-row converters and dict construction for every human
+EXPORT_SQL = f"""
+    SELECT {", ".join(FIELD_TO_SHORT)},
+        CAST(ROUND(bp.longitude::numeric, 3) AS DOUBLE PRECISION),
+        CAST(ROUND(bp.latitude::numeric, 3) AS DOUBLE PRECISION),
+        EXISTS (
+            SELECT 1 FROM {NotableHuman.attributes.through._meta.db_table} ha WHERE ha.notablehuman_id = h.wikidata_id
+        )
+    FROM {NotableHuman._meta.db_table} h
+    JOIN {Place._meta.db_table} bp ON bp.wikidata_id = h.birth_place_id
+    LEFT JOIN {Place._meta.db_table} dp ON dp.wikidata_id = h.death_place_id
+    WHERE h.birth_year IS NOT NULL
+      AND bp.latitude IS NOT NULL
+      AND bp.longitude IS NOT NULL
+      AND h.wikidata_id BETWEEN %s AND %s
+"""  # noqa: S608, SLF001
+
+# Attribute category -> short property key used in the exported GeoJSON
+CAT_TO_SHORT = {
+    "academic_degree": "ad",
+    "award_received": "ar",
+    "cause_of_death": "cod",
+    "conflict": "c",
+    "convicted_of": "co",
+    "educated_at": "ed",
+    "ethnic_group": "eg",
+    "field_of_work": "fw",
+    "gender": "g",
+    "handedness": "h",
+    "honorific_prefix": "hp",
+    "manner_of_death": "md",
+    "medical_condition": "mc",
+    "member_of": "mo",
+    "native_language": "nl",
+    "occupation": "o",
+    "political_ideology": "pi",
+    "position_held": "ph",
+    "religion_or_worldview": "wv",
+    "social_classification": "sc",
+}
+
+
+def get_exportable_humans():
+    """
+    Humans with a birth year and a located birth place.
+    """
+    return NotableHuman.objects.filter(
+        birth_year__isnull=False, birth_place__latitude__isnull=False, birth_place__longitude__isnull=False
+    )
+
+
+def get_shard_bounds(limit=None):
+    """
+    Split the exported humans into keyset ranges of EXPORT_CHUNK_SIZE as (first_id, last_id) pairs, inclusive.
+    """
+    ids = get_exportable_humans().order_by("wikidata_id").values_list("wikidata_id", flat=True)
+    if limit:
+        ids = ids[:limit]
+    ids = list(ids)
+    return [(ids[i], ids[min(i + EXPORT_CHUNK_SIZE, len(ids)) - 1]) for i in range(0, len(ids), EXPORT_CHUNK_SIZE)]
+
+
+def get_attribute_labels(human_ids):
+    """
+    Fetch the attribute labels for a chunk of humans in one query, bucketed by human and category short code.
+    """
+    labels = defaultdict(lambda: defaultdict(list))
+    rows = NotableHuman.attributes.through.objects.filter(notablehuman_id__in=human_ids).values_list(
+        "notablehuman_id", "notablehumanattribute__category", "notablehumanattribute__label"
+    )
+    for human_id, category, label in rows:
+        labels[human_id][CAT_TO_SHORT[category]].append(label)
+    return labels
+
+
+def export_shard(bounds):
+    """
+    Serialize one keyset range of humans. Runs in a worker process when the export is parallelized.
+    Returns the encoded features and the number of humans read.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(EXPORT_SQL, bounds)
+        rows = cursor.fetchall()
+    # Only humans that have attributes go into the attribute lookup; skip the query when none do
+    human_ids_with_attributes = [row[0] for row in rows if row[-1]]
+    attribute_labels = get_attribute_labels(human_ids_with_attributes) if human_ids_with_attributes else {}
+
+    features = []
+    for row in rows:
+        longitude, latitude, _ = row[PROPERTY_COUNT:]
+        if not (latitude and longitude):
+            continue
+
+        # Direct fields in one comprehension (orjson serializes dates natively), then the attribute labels that
+        # were fetched and keyed by short code for the whole shard
+        properties = {
+            short_key: val for short_key, val in zip(SHORT_KEYS, row[:PROPERTY_COUNT], strict=True) if val is not None
+        }
+        if row[0] in attribute_labels:
+            properties |= attribute_labels[row[0]]
+
+        features.append(
+            orjson.dumps(
+                {
+                    "type": "Feature",
+                    "id": row[0],
+                    "geometry": {"type": "Point", "coordinates": [longitude, latitude]},
+                    "properties": properties,
+                }
+            )
+        )
+
+    return features, len(rows)
 
 
 class Command(BaseCommand):
@@ -13,113 +165,64 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('--limit', type=int, default=None, help='Limit number of humans to export')
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=EXPORT_WORKERS,
+            help="Number of processes serializing shards in parallel (1 disables multiprocessing)",
+        )
 
     def handle(self, *args, **options):
         limit = options['limit']
-
-        humans = NotableHuman.objects.filter(
-            birth_year__isnull=False, birth_place__latitude__isnull=False, birth_place__longitude__isnull=False
-        ).distinct()
-
-        if limit:
-            humans = humans[:limit]
-
-        def abbreviate_properties(human):
-            mapping = {
-                "wikidata_id": "id",
-                "wikipedia_url": "wu",
-                "name": "n",
-                "description": "d",
-                "birth_year": "by",
-                "birth_date": "bd",
-                "birth_place_name": "bp",
-                "death_year": "dy",
-                "death_date": "dd",
-                "death_place_name": "dp",
-                "article_created_date": "cd",
-                "article_length": "al",
-                "article_recent_views": "rv",
-                "article_total_edits": "te",
-                "article_recent_edits": "re",
-            }
-
-            props = {}
-
-            # Handle direct fields
-            for full_key, short_key in mapping.items():
-                val = getattr(human, full_key, None)
-                if val is not None:
-                    if hasattr(val, "isoformat"):
-                        val = val.isoformat()
-                    props[short_key] = val
-
-            # Handle related foreign key fields
-            if human.birth_place and human.birth_place.name:
-                props["bp"] = human.birth_place.name
-
-            if human.death_place and human.death_place.name:
-                props["dp"] = human.death_place.name
-
-            # Handle M2M attribute categories
-            for category, short in sorted({
-                                              "academic_degree": "ad",
-                                              "award_received": "ar",
-                                              "cause_of_death": "cod",
-                                              "conflict": "c",
-                                              "convicted_of": "co",
-                                              "educated_at": "ed",
-                                              "ethnic_group": "eg",
-                                              "field_of_work": "fw",
-                                              "gender": "g",
-                                              "handedness": "h",
-                                              "honorific_prefix": "hp",
-                                              "manner_of_death": "md",
-                                              "medical_condition": "mc",
-                                              "member_of": "mo",
-                                              "native_language": "nl",
-                                              "occupation": "o",
-                                              "political_ideology": "pi",
-                                              "position_held": "ph",
-                                              "religion_or_worldview": "wv",
-                                              "social_classification": "sc",
-                                          }.items()):
-                values = human.attributes.filter(category=category).values_list("label", flat=True)
-                values_list = list(values)
-                if values_list:
-                    props[short] = values_list
-
-            return props
-
-        features = []
-        for human in tqdm(humans, desc="Exporting Notable Humans"):
-            if not (human.birth_place and human.birth_place.latitude and human.birth_place.longitude):
-                continue
-
-            properties = abbreviate_properties(human)
-            if not properties:
-                continue
-
-            # Then use it inside your loop
-            feature = {
-                "type": "Feature",
-                "id": human.wikidata_id,
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": [
-                        round(float(human.birth_place.longitude), 3),
-                        round(float(human.birth_place.latitude), 3),
-                    ],
-                },
-                "properties": properties,
-            }
-
-            features.append(feature)
-
-        geojson = {"type": "FeatureCollection", "features": features}
-
-        output_path = os.path.join(os.getcwd(), "notablehumans/data_collection/management/notable_humans.geojson")
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(geojson, f, indent=4, ensure_ascii=False)
-
-        self.stdout.write(self.style.SUCCESS(f"Exported {len(features)} NotableHumans to notable_humans.geojson"))
+        workers = options["workers"]
+
+        shards = get_shard_bounds(limit)
+
+        if workers > 1 and len(shards) > 1:
+            # Forked workers must not share the parent's DB connection; each one opens its own
+            connections.close_all()
+            with multiprocessing.get_context("fork").Pool(min(workers, len(shards))) as pool:
+                feature_count = self.write_export(pool.imap(export_shard, shards))
+        else:
+            feature_count = self.write_export(map(export_shard, shards))
+
+        self.stdout.write(self.style.SUCCESS(f"Exported {feature_count} NotableHumans to notable_humans.geojson"))
+
+    def write_export(self, shard_results):
+        """
+        Write the shards, in order, to the FeatureCollection and GeoJSON Text Sequence files, then gzip both.
+        """
+        output_path = Path.cwd() / "notablehumans/data_collection/management/notable_humans.geojson"
+        # Same features as a GeoJSON Text Sequence, for clients that render features as they stream in
+        seq_output_path = Path.cwd() / "notablehumans/data_collection/management/notable_humans.geojsons"
+
+        # Stream features straight to disk so memory stays flat regardless of how many humans are exported
+        feature_count = 0
+        with (
+            output_path.open("wb", buffering=WRITE_BUFFER_SIZE) as f,
+            seq_output_path.open("wb", buffering=WRITE_BUFFER_SIZE) as seq_f,
+            tqdm(desc="Exporting Notable Humans") as progress,
+        ):
+            f.write(b'{"type":"FeatureCollection","features":[')
+            for features, humans_read in shard_results:
+                for feature_json in features:
+                    if feature_count:
+                        f.write(b",")
+                    f.write(feature_json)
+                    seq_f.write(GEOJSON_SEQ_RECORD_SEPARATOR + feature_json + b"\n")
+                    feature_count += 1
+                progress.update(humans_read)
+            f.write(b"]}")
+
+        # Compress once here so the API can hand out the brotli/gzip copies without compressing per request
+        for path in (output_path, seq_output_path):
+            with path.open("rb") as src, gzip.open(f"{path}.gz", "wb", GZIP_COMPRESS_LEVEL) as dst:
+                shutil.copyfileobj(src, dst, WRITE_BUFFER_SIZE)
+            br_path = path.with_name(f"{path.name}.br")
+            with path.open("rb") as src, br_path.open("wb", buffering=WRITE_BUFFER_SIZE) as dst:
+                compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+                while block := src.read(WRITE_BUFFER_SIZE):
+                    dst.write(compressor.process(block))
+                dst.write(compressor.finish())
+
+        return feature_count
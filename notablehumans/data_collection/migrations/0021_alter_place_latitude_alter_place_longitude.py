@@ -0,0 +1,23 @@
+# Generated by Django 5.0.11 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_collection', '0020_notablehuman_birth_year_notablehuman_death_year'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='place',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='place',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.11 on 2026-10-15 22:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_collection', '0021_alter_place_latitude_alter_place_longitude'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notablehuman',
+            index=models.Index(fields=['wikipedia_url'], name='nh_wikipedia_url'),
+        ),
+    ]
@@ -1,77 +1,187 @@
-from datetime import datetime
+from calendar import monthrange
+from datetime import date
+from functools import lru_cache
+from itertools import chain
 from urllib.parse import quote
 
 from django.core.exceptions import ValidationError
+from django.db import connections
 from django.db import models
-from django.utils.timezone import get_current_timezone
 from django.utils.timezone import now
 
 
+@lru_cache(maxsize=8192)
+def parse_coordinates(coord_string):
+    """
+    Parse coordinate string into latitude and longitude.
+    Cached because the same places (and so the same strings) recur across many humans.
+    """
+    if coord_string and not coord_string.startswith("http"):
+        if coord_string.startswith("Point(") and coord_string.endswith(")"):
+            # Common case: slice the WKT wrapper off instead of scanning the string with replace()
+            longitude, latitude = coord_string[6:-1].split(" ", 1)
+        else:
+            # Literals on other globes carry an IRI prefix ("<...entity/Q405> Point(...)"), so keep what follows
+            # the last "Point(" rather than replacing the wrapper out of the whole string
+            longitude, latitude = coord_string.rpartition("Point(")[2].rstrip(")").split()[:2]
+        return float(latitude), float(longitude)
+    return None, None
+
+
+@lru_cache(maxsize=65536)
+def parse_date(date_values, date_statements):
+    """
+    Parse the "|"-joined SPARQL date values/statements into (date, is_bc), taking the first valid candidate.
+    Cached because the same raw strings recur across many humans.
+    """
+    for candidate in chain(
+        date_values.split("|") if date_values else (),
+        date_statements.split("|") if date_statements else (),
+    ):
+        if candidate.startswith("http"):  # Skip URLs
+            continue
+
+        # Extract YYYY-MM-DD part (ignore the time portion)
+        date_str = candidate.strip().split("T", 1)[0]
+        is_bc = date_str.startswith("-")
+        if is_bc:
+            date_str = date_str[1:]
+
+        # Validate the shape and ranges up front so malformed candidates are skipped without raising
+        if len(date_str) != 10 or date_str[4] != "-" or date_str[7] != "-":
+            continue
+        if not (date_str[:4] + date_str[5:7] + date_str[8:]).isdigit():
+            continue
+        year, month, day = int(date_str[:4]), int(date_str[5:7]), int(date_str[8:])
+        if not (year and 1 <= month <= 12 and 1 <= day <= monthrange(year, month)[1]):
+            continue
+
+        return date(year, month, day), is_bc
+
+    return None, False  # No valid date found
+
+
+@lru_cache(maxsize=100_000)
+def get_article_path(title):
+    """
+    Percent-encoded path of an English Wikipedia article title, as stored in NotableHuman.wikipedia_url.
+    """
+    return quote(title.replace(" ", "_"), safe=":/")
+
+
+@lru_cache(maxsize=100_000)
+def get_article_uri(title):
+    """
+    SPARQL IRI for an English Wikipedia article title.
+    Cached because the same titles are re-queried on every re-scrape.
+    """
+    return f"<https://en.wikipedia.org/wiki/{get_article_path(title)}>"
+
+
+class BulkUpsertManager(models.Manager):
+    # Columns written besides the primary key, and the subset that decides whether an existing row is rewritten
+    upsert_fields = ()
+    compare_fields = ()
+
+    def bulk_upsert(self, objs):
+        """
+        Insert new rows and update changed ones in a single statement (PostgreSQL).
+        Rows are streamed into a temp table with COPY and merged with INSERT ... ON CONFLICT DO UPDATE,
+        which only rewrites rows whose compare_fields actually changed.
+        """
+        pk = self.model._meta.pk.attname  # noqa: SLF001
+        columns = (pk, *self.upsert_fields)
+        rows = {getattr(obj, pk): tuple(getattr(obj, column) for column in columns) for obj in objs}
+        if not rows:
+            return
+
+        table = self.model._meta.db_table  # noqa: SLF001
+        temp_table = f"{table}_upsert"
+        column_list = ", ".join(columns)
+        updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in self.upsert_fields)
+        changed = " OR ".join(f"{table}.{column} IS DISTINCT FROM EXCLUDED.{column}" for column in self.compare_fields)
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(f"CREATE TEMP TABLE {temp_table} (LIKE {table} INCLUDING DEFAULTS)")
+            try:
+                with cursor.copy(f"COPY {temp_table} ({column_list}) FROM STDIN") as copy:
+                    for row in rows.values():
+                        copy.write_row(row)
+                cursor.execute(
+                    f"""
+                    INSERT INTO {table} ({column_list})
+                    SELECT {column_list} FROM {temp_table}
+                    ON CONFLICT ({pk}) DO UPDATE SET {updates}
+                    WHERE {changed}
+                    """  # noqa: S608
+                )
+            finally:
+                cursor.execute(f"DROP TABLE IF EXISTS {temp_table}")
+
+
+class PlaceManager(BulkUpsertManager):
+    upsert_fields = ("name", "latitude", "longitude", "last_updated")
+    compare_fields = ("name", "latitude", "longitude")
+
+
+class NotableHumanAttributeManager(BulkUpsertManager):
+    upsert_fields = ("label", "category", "last_updated")
+    compare_fields = ("label", "category")
+
+
+# (label, id, coordinates) SPARQL result keys for the birth and death places
+PLACE_RESULT_KEYS = (
+    ("birthPlaceLabel", "birthPlaceID", "birthPlaceCoordinates"),
+    ("deathPlaceLabel", "deathPlaceID", "deathPlaceCoordinates"),
+)
+
+
 class Place(models.Model):
     wikidata_id = models.CharField(max_length=255, primary_key=True)
     name = models.CharField(max_length=255)
-    latitude = models.DecimalField(
-        max_digits=9,
-        decimal_places=6,
-        null=True,
-        blank=True,
-    )
-    longitude = models.DecimalField(
-        max_digits=9,
-        decimal_places=6,
-        null=True,
-        blank=True,
-    )
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
     last_updated = models.DateTimeField(default=now)
 
+    objects = PlaceManager()
+
     def __str__(self):
         return self.name
 
+    parse_coordinates = staticmethod(parse_coordinates)
+
     @staticmethod
-    def parse_coordinates(coord_string):
+    def parse_and_update(result, recent_updates, existing_records, updated_at=None):
         """
-        Parse coordinate string into latitude and longitude.
+        Parse the birth/death places of a SPARQL result row ({variable: value}).
+        Returns (to_create, to_update) dicts keyed by wikidata_id; changed existing places are updated
+        in memory only, so the caller can persist both with one Place.objects.bulk_upsert.
+        Pass updated_at to stamp every place of a batch with the same time instead of calling now() per place.
         """
-        if coord_string and not coord_string.startswith("http"):
-            coord_parts = coord_string.replace("Point(", "").replace(")", "").split()
-            return float(coord_parts[1]), float(coord_parts[0])
-        return None, None
-
-    @staticmethod
-    def parse_and_update(result, recent_updates, existing_records):
+        updated_at = updated_at or now()
         to_create = {}
-        for place_label_key, place_id_key, coord_key in [
-            ("birthPlaceLabel", "birthPlaceID", "birthPlaceCoordinates"),
-            ("deathPlaceLabel", "deathPlaceID", "deathPlaceCoordinates"),
-        ]:
-            place_id = result.get(place_id_key, {}).get("value")
+        to_update = {}
+        for place_label_key, place_id_key, coord_key in PLACE_RESULT_KEYS:
+            place_id = result.get(place_id_key)
             if place_id and place_id not in recent_updates:
-                place_data = {
-                    "name": result.get(place_label_key, {}).get("value"),
-                    "latitude": None
-                    if not coord_key
-                    else Place.parse_coordinates(result.get(coord_key, {}).get("value"))[0],
-                    "longitude": None
-                    if not coord_key
-                    else Place.parse_coordinates(result.get(coord_key, {}).get("value"))[1],
-                }
-                if place_id and place_id in existing_records:
+                latitude, longitude = parse_coordinates(result.get(coord_key))
+                name = result.get(place_label_key)
+                if place_id in existing_records:
                     # Update existing place
                     place = existing_records[place_id]
-                    if (
-                        place.name != place_data["name"]
-                        or place.latitude != place_data["latitude"]
-                        or place.longitude != place_data["longitude"]
-                    ):
-                        place.name = place_data["name"]
-                        place.latitude = place_data["latitude"]
-                        place.longitude = place_data["longitude"]
-                        place.last_updated = now()  # Mark as updated
-                        place.save()
+                    if (place.name, place.latitude, place.longitude) != (name, latitude, longitude):
+                        place.name, place.latitude, place.longitude = name, latitude, longitude
+                        place.last_updated = updated_at  # Mark as updated
+                        to_update[place_id] = place
                 elif place_id not in to_create:
-                    to_create[place_id] = Place(wikidata_id=place_id, **place_data)
+                    to_create[place_id] = Place(
+                        wikidata_id=place_id,
+                        name=name,
+                        latitude=latitude,
+                        longitude=longitude,
+                        last_updated=updated_at,
+                    )
 
-        return to_create
+        return to_create, to_update
 
 
 class AttributeType(models.TextChoices):
@@ -103,6 +213,8 @@ class NotableHumanAttribute(models.Model):
     category = models.CharField(max_length=50, choices=AttributeType.choices)
     last_updated = models.DateTimeField(default=now)
 
+    objects = NotableHumanAttributeManager()
+
     def __str__(self):
         return f"{self.wikidata_id}: {self.label} ({self.get_category_display()})"
 
@@ -112,6 +224,119 @@ class NotableHumanAttribute(models.Model):
         super().save(*args, **kwargs)
 
 
+class NotableHumanQuerySet(models.QuerySet):
+    def with_attrs_by_category(self):
+        """
+        Prefetch every human's attributes in one extra query, so get_genders()/get_occupations() in a loop
+        don't issue a query per human.
+        """
+        return self.prefetch_related(
+            models.Prefetch(
+                "attributes", queryset=NotableHumanAttribute.objects.only("wikidata_id", "label", "category")
+            )
+        )
+
+
+# Wikidata property for each optional attribute field, in query order
+OPTIONAL_FIELDS = {
+    "gender": "P21",
+    "occupation": "P106",
+    "ethnic_group": "P172",
+    "field_of_work": "P101",
+    "member_of": "P463",
+    "manner_of_death": "P1196",
+    "cause_of_death": "P509",
+    "handedness": "P552",
+    "convicted_of": "P1399",
+    "award_received": "P166",
+    "native_language": "P103",
+    "political_ideology": "P102",
+    "honorific_prefix": "P511",
+    "religion_or_worldview": "P140",
+    "medical_condition": "P1050",
+    "conflict": "P607",
+    "educated_at": "P69",
+    "academic_degree": "P512",
+    "social_classification": "P3716",
+    "position_held": "P39",
+}
+
+# One OPTIONAL subquery per optional field. Each one aggregates its own "ID||label@@..." values per human before
+# joining, so asking for every field at once doesn't multiply rows across fields. Each subquery INCLUDEs the
+# batch's items from the %items named subquery, so it is scoped to the batch rather than evaluated over all of
+# Wikidata without repeating the batch's VALUES in every subquery.
+OPTIONAL_FIELD_SUBQUERIES = "".join(
+    f"""
+                     OPTIONAL {{{{
+                       SELECT ?item
+                         (GROUP_CONCAT(DISTINCT CONCAT(?{field}ID, "||", ?{field}Label); SEPARATOR="@@") AS ?{field})
+                       WHERE {{{{
+                         INCLUDE %items
+                         ?item p:{p_value} ?{field}Statement.
+                         ?{field}Statement ps:{p_value} ?{field}Entity.
+                         ?{field}Entity rdfs:label ?{field}Label.
+                         BIND(STRAFTER(STR(?{field}Entity), "/entity/") AS ?{field}ID)
+                         FILTER(LANG(?{field}Label) = "en")
+                       }}}}
+                       GROUP BY ?item
+                     }}}}"""
+    for field, p_value in OPTIONAL_FIELDS.items()
+)
+OPTIONAL_FIELD_VARIABLES = " ".join(f"?{field}" for field in OPTIONAL_FIELDS)
+
+# The whole query for a batch of titles, built once at import with a {batch_items} placeholder. The batch's items
+# are bound once, in a Blazegraph named subquery (WITH ... AS %items), and INCLUDEd wherever they are needed, so the
+# query grows linearly with the number of titles.
+SPARQL_QUERY_TEMPLATE = f""" SELECT ?item ?itemLabel ?article ?wikipediaUrl
+                          (GROUP_CONCAT(DISTINCT STR(?dob); separator="|") AS ?dobValues)
+                          (GROUP_CONCAT(DISTINCT STR(?dobStatement); separator="|") AS ?dobStatements)
+                          (GROUP_CONCAT(DISTINCT STR(?dod); separator="|") AS ?dodValues)
+                          (GROUP_CONCAT(DISTINCT STR(?dodStatement); separator="|") AS ?dodStatements)
+                          ?birthPlace ?birthPlaceLabel ?birthPlaceID ?birthPlaceCoordinates
+                          ?deathPlace ?deathPlaceLabel ?deathPlaceID ?deathPlaceCoordinates
+                          {OPTIONAL_FIELD_VARIABLES}
+                   WITH {{{{
+                     SELECT ?item ?article WHERE {{{{
+                       {{batch_items}}
+                       ?item wdt:P31 wd:Q5.
+                     }}}}
+                   }}}} AS %items
+                   WHERE {{{{
+                     INCLUDE %items
+
+                     ?item rdfs:label ?itemLabel.
+                     FILTER(LANG(?itemLabel) = "en")
+                     OPTIONAL {{{{
+                       ?wikipediaUrl schema:about ?article .
+                       FILTER(CONTAINS(STR(?wikipediaUrl), "en.wikipedia.org"))
+                     }}}}
+                     OPTIONAL {{{{ ?item wdt:P569 ?dob. }}}}         # Direct birth date
+                     OPTIONAL {{{{ ?item p:P569/ps:P569 ?dobStatement. }}}}  # Birth date statement
+
+                     OPTIONAL {{{{ ?item wdt:P570 ?dod. }}}}         # Direct death date
+                     OPTIONAL {{{{ ?item p:P570 ?dodStatement. }}}}  # Death date statement
+                     OPTIONAL {{{{
+                       ?item wdt:P19 ?birthPlace.
+                       ?birthPlace rdfs:label ?birthPlaceLabel;
+                         wdt:P625 ?birthPlaceCoordinates.
+                       BIND(STRAFTER(STR(?birthPlace), "/entity/") AS ?birthPlaceID)
+                       FILTER(LANG(?birthPlaceLabel) = "en")
+                     }}}}
+                     OPTIONAL {{{{
+                       ?item wdt:P20 ?deathPlace.
+                       ?deathPlace rdfs:label ?deathPlaceLabel;
+                         wdt:P625 ?deathPlaceCoordinates.
+                       BIND(STRAFTER(STR(?deathPlace), "/entity/") AS ?deathPlaceID)
+                       FILTER(LANG(?deathPlaceLabel) = "en")
+                     }}}}{OPTIONAL_FIELD_SUBQUERIES}
+                   }}}}
+                   GROUP BY ?item ?itemLabel ?article ?wikipediaUrl ?dobValues ?dobStatements ?dodValues ?dodStatements
+                            ?birthPlace ?birthPlaceLabel ?birthPlaceID ?birthPlaceCoordinates
+                            ?deathPlace ?deathPlaceLabel ?deathPlaceID ?deathPlaceCoordinates
+                            {OPTIONAL_FIELD_VARIABLES}
+                   """
+
+
 class NotableHuman(models.Model):
     UNRATED_ARTICLE = "unrated"
     GOOD_ARTICLE = "good"
@@ -160,168 +385,104 @@ class NotableHuman(models.Model):
     article_recent_edits = models.IntegerField(null=True, blank=True)
     last_wikipedia_update = models.DateTimeField(null=True, blank=True)
 
+    objects = NotableHumanQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Each SPARQL batch looks its titles up by wikipedia_url to query the items it already knows directly
+            models.Index(fields=["wikipedia_url"], name="nh_wikipedia_url"),
+        ]
+
     def __str__(self):
         return f"{self.name or 'Unknown'} ({self.wikidata_id})"
 
     @staticmethod
-    def get_sparql_query(titles, attribute_batch, is_first_batch):
-        if is_first_batch:
-            query_select = """SELECT ?item ?itemLabel ?article ?wikipediaUrl
-                          (GROUP_CONCAT(DISTINCT STR(?dob); separator="|") AS ?dobValues)
-                          (GROUP_CONCAT(DISTINCT STR(?dobStatement); separator="|") AS ?dobStatements)
-                          (GROUP_CONCAT(DISTINCT STR(?dod); separator="|") AS ?dodValues)
-                          (GROUP_CONCAT(DISTINCT STR(?dodStatement); separator="|") AS ?dodStatements)
-                          ?birthPlace ?birthPlaceLabel ?birthPlaceID ?birthPlaceCoordinates
-                          ?deathPlace ?deathPlaceLabel ?deathPlaceID ?deathPlaceCoordinates"""
-            query_body = """OPTIONAL {{
-                       ?wikipediaUrl schema:about ?article .
-                       FILTER(CONTAINS(STR(?wikipediaUrl), "en.wikipedia.org"))
-                     }}
-                     OPTIONAL {{ ?item wdt:P569 ?dob. }}         # Direct birth date
-                     OPTIONAL {{ ?item p:P569/ps:P569 ?dobStatement. }}  # Birth date statement
-
-                     OPTIONAL {{ ?item wdt:P570 ?dod. }}         # Direct death date
-                     OPTIONAL {{ ?item p:P570 ?dodStatement. }}  # Death date statement
-                     OPTIONAL {{
-                       ?item wdt:P19 ?birthPlace.
-                       ?birthPlace rdfs:label ?birthPlaceLabel;
-                         wdt:P625 ?birthPlaceCoordinates.
-                       BIND(STRAFTER(STR(?birthPlace), "/entity/") AS ?birthPlaceID)
-                       FILTER(LANG(?birthPlaceLabel) = "en")
-                     }}
-                     OPTIONAL {{
-                       ?item wdt:P20 ?deathPlace.
-                       ?deathPlace rdfs:label ?deathPlaceLabel;
-                         wdt:P625 ?deathPlaceCoordinates.
-                       BIND(STRAFTER(STR(?deathPlace), "/entity/") AS ?deathPlaceID)
-                       FILTER(LANG(?deathPlaceLabel) = "en")
-                     }}"""
-            query_groupbys = """?article ?wikipediaUrl ?dobValues ?dobStatements ?dodValues ?dodStatements
-                            ?birthPlace ?birthPlaceLabel ?birthPlaceID ?birthPlaceCoordinates
-                            ?deathPlace ?deathPlaceLabel ?deathPlaceID ?deathPlaceCoordinates"""
-        else:
-            query_select = """SELECT ?item ?itemLabel"""
-            query_body = ""
-            query_groupbys = ""
-
-        optional_fields = {
-            "gender": "P21",
-            "occupation": "P106",
-            "ethnic_group": "P172",
-            "field_of_work": "P101",
-            "member_of": "P463",
-            "manner_of_death": "P1196",
-            "cause_of_death": "P509",
-            "handedness": "P552",
-            "convicted_of": "P1399",
-            "award_received": "P166",
-            "native_language": "P103",
-            "political_ideology": "P102",
-            "honorific_prefix": "P511",
-            "religion_or_worldview": "P140",
-            "medical_condition": "P1050",
-            "conflict": "P607",
-            "educated_at": "P69",
-            "academic_degree": "P512",
-            "social_classification": "P3716",
-            "position_held": "P39",
-        }
-
-        optional_group_concats = []
-        optional_statements = []
-        for field, p_value in optional_fields.items():
-            if field not in attribute_batch:
-                continue
-
-            group_concat = (
-                f"""(GROUP_CONCAT(DISTINCT CONCAT(?{field}ID, "||", ?{field}); SEPARATOR="@@") AS ?{field})"""
-            )
-            optional_group_concats.append(group_concat)
-            statement = f"""
-                OPTIONAL {{
-                    ?item p:{p_value} ?{field}Statement.
-                    ?{field}Statement ps:{p_value} ?{field}Entity.
-                    ?{field}Entity rdfs:label ?{field}.
-                    BIND(STRAFTER(STR(?{field}Entity), "/entity/") AS ?{field}ID)
-                    FILTER(LANG(?{field}) = "en")
-                }}
-                """
-            optional_statements.append(statement)
-
-        optional_group_concats = "\n".join(optional_group_concats)
-        optional_statements = "\n".join(optional_statements)
-
+    def get_sparql_query(titles, known_items=None):
         """
         Generates the SPARQL query for a list of titles.
+        Titles whose item is already known ({title: wikidata_id}) are bound to it directly, so only the rest go
+        through the open schema:about lookup; ?article stays bound for every title either way.
+        Known pairs still have to match schema:about, so an item that was merged away or lost the article's sitelink
+        returns no row instead of tying the title to the wrong item.
         """
-        # Build the query here, assuming titles is a list
-        articles_str = " ".join(
-            [f"<https://en.wikipedia.org/wiki/{quote(title.replace(' ', '_'), safe=':/')}>" for title in titles]
-        )
-        return f""" {query_select}
-                          {optional_group_concats}
-                   WHERE {{
-                     VALUES ?article {{ {articles_str} }}
-
-                     ?article schema:about ?item.
-
-                     ?item rdfs:label ?itemLabel;
-                           wdt:P31 wd:Q5.
-                     FILTER(LANG(?itemLabel) = "en")
-                     {query_body}
-                     {optional_statements}
-                   }}
-                   GROUP BY ?item ?itemLabel {query_groupbys}
-                   """
+        known_items = known_items or {}
+        unknown_titles = [title for title in titles if title not in known_items]
+        clauses = []
+        if unknown_titles or not known_items:
+            articles = " ".join(map(get_article_uri, unknown_titles))
+            clauses.append(f"VALUES ?article {{ {articles} }} ?article schema:about ?item.")
+        if len(unknown_titles) < len(titles):
+            pairs = " ".join(
+                f"(wd:{known_items[title]} {get_article_uri(title)})" for title in titles if title in known_items
+            )
+            clauses.append(f"VALUES (?item ?article) {{ {pairs} }} ?article schema:about ?item.")
+        batch_items = " UNION ".join(f"{{ {clause} }}" for clause in clauses) if len(clauses) > 1 else clauses[0]
+        return SPARQL_QUERY_TEMPLATE.format_map({"batch_items": batch_items})
 
     @staticmethod
-    def parse_date(date_values, date_statements):
-        # Initialize a set to hold valid date candidates
-        date_candidates = set()
-
-        # Add dobValues to candidates if it is not a URL and is valid date
-        if date_values:
-            for value in date_values.split("|"):
-                if not value.startswith("http"):  # Skip URLs
-                    date_candidates.add(value.strip())  # Add cleaned value to set
-
-        # Add dobStatements to candidates
-        if date_statements:
-            for statement in date_statements.split("|"):
-                if not statement.startswith("http"):  # Skip URLs
-                    date_candidates.add(statement.strip())  # Add cleaned statement to set
-
-        # If no valid date candidates found, return None
-        if not date_candidates:
-            return None, False
-
-        # Try to parse each candidate date string
-        for date_str in date_candidates:
-            try:
-                # Extract YYYY-MM-DD part (ignore the time portion)
-                date_str = date_str.split("T")[0]
-                if date_str[0] == "-":
-                    date_str = date_str[1:]
-                    is_bc = True
-                else:
-                    is_bc = False
-
-                year, month, day = map(int, date_str.split("-"))
+    def get_known_items(titles):
+        """
+        Map the titles of humans already stored to their wikidata_id ({title: wikidata_id}) with one IN query.
+        """
+        titles_by_path = {get_article_path(title): title for title in titles}
+        return {
+            titles_by_path[wikipedia_url]: wikidata_id
+            for wikipedia_url, wikidata_id in NotableHuman.objects.filter(
+                wikipedia_url__in=titles_by_path
+            ).values_list("wikipedia_url", "wikidata_id")
+        }
 
-                return datetime(year, month, day, tzinfo=get_current_timezone()).date(), is_bc
+    parse_date = staticmethod(parse_date)
 
-            except ValueError:
-                continue  # Skip invalid date strings
+    @classmethod
+    def bulk_set_attributes(cls, attribute_ids_by_human):
+        """
+        Replace each human's attributes with the given ids ({human_id: [attribute_id, ...]}) inside PostgreSQL:
+        the wanted links go over as two parallel arrays, one DELETE drops the stale links and one
+        INSERT ... ON CONFLICT DO NOTHING adds the missing ones, instead of a .set() per human.
+        """
+        if not attribute_ids_by_human:
+            return
+
+        human_ids, attr_ids = [], []
+        for human_id, attribute_ids in attribute_ids_by_human.items():
+            human_ids.extend([human_id] * len(attribute_ids))
+            attr_ids.extend(attribute_ids)
+
+        through_table = cls.attributes.through._meta.db_table  # noqa: SLF001
+        with connections[cls.objects.db].cursor() as cursor:
+            cursor.execute(
+                f"""
+                DELETE FROM {through_table} ha
+                WHERE ha.notablehuman_id = ANY(%s)
+                AND (ha.notablehuman_id, ha.notablehumanattribute_id) NOT IN (
+                    SELECT * FROM unnest(%s::text[], %s::text[])
+                )
+                """,  # noqa: S608
+                [list(attribute_ids_by_human), human_ids, attr_ids],
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO {through_table} (notablehuman_id, notablehumanattribute_id)
+                SELECT * FROM unnest(%s::text[], %s::text[])
+                ON CONFLICT DO NOTHING
+                """,  # noqa: S608
+                [human_ids, attr_ids],
+            )
 
-        return None, False  # No valid date found
+    def get_attributes_by_category(self, category):
+        # Humans from with_attrs_by_category() filter the prefetch cache in Python instead of querying again
+        if "attributes" in getattr(self, "_prefetched_objects_cache", {}):
+            return [attribute for attribute in self.attributes.all() if attribute.category == category]
+        return self.attributes.filter(category=category)
 
     def get_genders(self):
-        return self.attributes.filter(category=AttributeType.GENDER)
+        return self.get_attributes_by_category(AttributeType.GENDER)
 
     def get_occupations(self):
-        return self.attributes.filter(category=AttributeType.OCCUPATION)
+        return self.get_attributes_by_category(AttributeType.OCCUPATION)
 
-    def save(self, *args, **kwargs):
+    def set_years(self):
         if self.birth_date:
             self.birth_year = -self.birth_date.year if self.is_birth_bc else self.birth_date.year
         else:
@@ -332,4 +493,6 @@ class NotableHuman(models.Model):
         else:
             self.death_year = None
 
+    def save(self, *args, **kwargs):
+        self.set_years()
         super().save(*args, **kwargs)
@@ -1,60 +1,199 @@
 import hashlib
-import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
 from datetime import timedelta
 from http import HTTPStatus
+from itertools import chain
+from uuid import uuid4
 from dateutil import parser as dateparser
 from dateutil.parser import ParserError
 import re
 
+import ijson
+import orjson
 import redis
 import requests
 import random
 from bs4 import BeautifulSoup
+from celery import chord
 from celery import group
 from celery import shared_task
-from celery.exceptions import Ignore
 from celery.utils.log import get_task_logger
 from django.db import transaction
 from django.db.models import Q
 from django.utils.timezone import get_default_timezone
 from django.utils.timezone import make_aware
 from django.utils.timezone import now
-from SPARQLWrapper import JSON
-from SPARQLWrapper import SPARQLWrapper
-from SPARQLWrapper.SPARQLExceptions import QueryBadFormed
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from .models import AttributeType
 from .models import NotableHuman
 from .models import NotableHumanAttribute
 from .models import Place
+from .models import get_article_uri
 
 logger = get_task_logger(__name__)
 
 
-ATTRIBUTE_CHOICES = list(AttributeType.values)
+ATTRIBUTE_CHOICES = tuple(AttributeType.values)
 REDIS_CLIENT = redis.StrictRedis(host="localhost", port=6379, db=0, decode_responses=True)
 LOCK_EXPIRE_TIME = 30  # 30 second expiration for locks
+LOCK_POLL_INTERVAL = 0.5  # How often a task waiting on another's lock checks whether it has been released
+# A day's titles are kept briefly after fetching, so a duplicate task that waited on the lock can return them too
+DAY_TITLES_EXPIRE_TIME = 60 * 10
+# A day's links are also kept with the page revision they were read from, so later runs only re-read every page of
+# links when the day's article has been edited since
+DAY_LINKS_EXPIRE_TIME = 60 * 60 * 24 * 7
+# A scheduled batch stays locked until its task finishes (or for at most 5 minutes if the task never runs)
+BATCH_LOCK_EXPIRE_TIME = 300
+# Each day of the year has a "<Month>_<day>" page on Wikipedia
+MONTHS = (
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
 WIKIPEDIA_API_URL = "https://en.wikipedia.org/w/api.php"
+MAXLAG_RETRIES = 3  # Times a day task asks for a page again while the API reports lagging replicas, before giving up
 WIKIDATA_SPARQL_ENDPOINT = "https://query.wikidata.org/sparql"
-BATCH_SIZE = 50  # Number of titles per batch for SPARQL query
+# Number of titles per batch for SPARQL query. All of a day's titles are known up front, so batches are sized here
+# rather than re-merged on the worker: each batch is one SPARQL query and one transaction.
+SPARQL_BATCH_SIZE = 200
+WIKIPEDIA_BATCH_SIZE = 50  # Number of humans per process_wikipedia_batch task
+# Info pages process_wikipedia_batch fetches at once (the shared session's pool keeps their connections warm)
+WIKIPEDIA_FETCH_WORKERS = 4
+# Batches a worker starts per minute: with WIKIPEDIA_FETCH_WORKERS fetching side by side, this is what keeps the
+# load on index.php?action=info bounded now that the pages of a batch aren't fetched one by one with a sleep between
+WIKIPEDIA_BATCH_RATE_LIMIT = "4/m"
+WIKIPEDIA_MAX_REDIRECTS = 5  # Redirect hops followed from an info page before giving up
+# Fields process_wikipedia_batch fills in from a human's Wikipedia info page
+WIKIPEDIA_METADATA_FIELDS = [
+    "wikipedia_url",
+    "description",
+    "article_length",
+    "article_recent_views",
+    "article_total_edits",
+    "article_recent_edits",
+    "article_quality",
+    "article_created_date",
+    "last_wikipedia_update",
+]
 RATE_LIMIT = "20/m"
-OPTIONAL_FIELD_BATCH_SIZE = 5  # Chunk size of optional fields (attributes) per SPARQL query
+# The day tasks only read the MediaWiki API (which asks clients to back off through maxlag), so on their own queue
+# they can go faster than the SPARQL batches, which the Wikidata query service limits much more tightly
+WIKIPEDIA_RATE_LIMIT = "60/m"
+# The SPARQL rows of a batch are cached briefly, so a redelivered or retried batch skips the round trip. The cache
+# shares Redis with the Celery broker, so entries are short-lived and large result sets are not cached at all.
+SPARQL_CACHE_EXPIRE_TIME = 60 * 15
+SPARQL_CACHE_MAX_BYTES = 1024 * 1024
+# Sorted set of titles a SPARQL query found no human for, scored by when: they are left out of new batches until
+# their entry is NON_HUMAN_TITLE_EXPIRE_TIME old, in case the article or its Wikidata item changes in the meantime
+NON_HUMAN_TITLES_KEY = "notable_humans:non_human_titles"
+NON_HUMAN_TITLE_EXPIRE_TIME = 60 * 60 * 24 * 30
+# Every non-human title heuristic as one alternation, so each title is scanned once
+NON_HUMAN_TITLE_RE = re.compile(
+    # Specific prefixes or generic terms anywhere in the title ("talk:" also covers "Template talk:")
+    r"category:|template:|file:|talk:|list of|portal:|wikipedia:"
+    # Starting with a number (ignoring whitespace), unless it ends with parentheses for birth-death years
+    r"|^\s*[0-9](?!.*\)$)"
+    # Ending with a number (ignoring whitespace)
+    r"|[0-9]\s*$",
+    re.IGNORECASE,
+)
+# Everything but the digits of a formatted number on a Wikipedia info page ("1,234 bytes")
+NON_DIGIT_RE = re.compile(r"\D")
+# (id, label) pairs in a SPARQL attribute value: "ID||label" pairs joined with "@@"
+ATTRIBUTE_PAIR_RE = re.compile(r"([^|@]*)\|\|(.*?)(?:@@|$)", re.DOTALL)
+
+# Deletes a lock (KEYS[1]) only if it still holds this task's token (ARGV[1]): a lock that expired and was taken
+# by another task is left alone
+RELEASE_LOCK_SCRIPT = REDIS_CLIENT.register_script(
+    """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+)
+# Deletes a batch's lock (KEYS[1]) if it still holds this task's token (ARGV[2]), deletes its scheduling lock
+# (KEYS[3]) only if it is still owned by this task (ARGV[1]) and decrements the task's batch counter (KEYS[2]),
+# returning what's left
+RELEASE_BATCH_SCRIPT = REDIS_CLIENT.register_script(
+    """
+    if redis.call('GET', KEYS[1]) == ARGV[2] then
+        redis.call('DEL', KEYS[1])
+    end
+    if redis.call('GET', KEYS[3]) == ARGV[1] then
+        redis.call('DEL', KEYS[3])
+    end
+    return redis.call('DECR', KEYS[2])
+    """
+)
 
-# Create a shared session object for reusing HTTP connections
+# Create a shared session object for reusing HTTP connections. The pool is sized for the gevent IO worker's
+# concurrency (-c 100) so greenlets keep their TLS connections warm across plcontinue pages and info page
+# fetches instead of reconnecting.
 session = requests.Session()
+session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=50,
+        pool_maxsize=100,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+    ),
+)
+# SPARQL queries share the same connections, but get_human_details backs off on 429s itself, so don't retry here
+session.mount("https://query.wikidata.org", HTTPAdapter(max_retries=0))
+session.headers.update({"User-Agent": "NotableHumans/1.0 (mailto:jcmeyer23@gmail.com)"})
+
+
+# Both fetch tasks are safe to run twice (a day's links are re-read, a batch is upserted), so they are only
+# acknowledged once finished: a worker dying mid-request puts the task back on the queue instead of losing it.
+# The limits leave room for waiting out another task's day lock plus a few pages of links and maxlag back-offs.
+@shared_task(
+    rate_limit=WIKIPEDIA_RATE_LIMIT,
+    time_limit=150,
+    soft_time_limit=120,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def get_linked_titles_from_day(month, day):
+    """
+    Returns the human-looking titles linked from a day's Wikipedia page for the chord callback to batch.
+    Never raises: the callback only runs once every day in the chord has returned, so a single failing day
+    (an unexpected response, a Redis error, the soft time limit) must give back no titles rather than drop the
+    whole run.
+    """
+    try:
+        return fetch_linked_titles(month, day)
+    except Exception as e:
+        logger.error(f"Error fetching linked titles for {month} {day}: {e}")
+        return []
 
 
-@shared_task(rate_limit=RATE_LIMIT)
-def get_linked_titles_from_day(month, day):
+def fetch_linked_titles(month, day):
     """
     Fetch the Wikipedia article content for a specific day of the year,
     extract links to other Wikipedia articles, and filter for human-related titles.
+    Returns the titles (an empty list if the day could not be fetched).
     """
     lock_key = f"wiki_task:{month}:{day}"
+    titles_key = f"wiki_titles:{month}:{day}"
+    revision_key = f"wiki_links:{month}:{day}"
+    token = uuid4().hex
 
-    # Acquire lock to ensure only one task per (month, day)
-    if REDIS_CLIENT.set(lock_key, "locked", ex=LOCK_EXPIRE_TIME, nx=True):
+    # Acquire lock to ensure only one task per (month, day), or wait for the task holding it to finish
+    if acquire_or_wait(lock_key, token, LOCK_EXPIRE_TIME):
         try:
             day_title = f"{month}_{day}"
 
@@ -63,51 +202,91 @@ def get_linked_titles_from_day(month, day):
                 params = {
                     "action": "query",
                     "format": "json",
-                    "prop": "links",
+                    "formatversion": 2,  # Pages come back as a plain list, missing ones flagged rather than keyed "-1"
+                    "maxlag": 5,  # Let the API tell us to back off when its replicas are lagging
+                    "prop": "info|links",  # info adds the page's lastrevid to check against the cached links
                     "titles": day_title,
                     "pllimit": "max",
                 }
                 continue_query = True
                 plcontinue = None
+                revision_id = None
+                maxlag_retries = 0
+                cached_links = REDIS_CLIENT.get(revision_key)
+                cached_links = orjson.loads(cached_links) if cached_links else None
 
                 while continue_query:
                     if plcontinue:
                         params["plcontinue"] = plcontinue
 
-                    response = session.get(WIKIPEDIA_API_URL, params=params)
+                    response = session.get(WIKIPEDIA_API_URL, params=params, timeout=15)
                     response.raise_for_status()  # Raise an error for HTTP errors
 
-                    data = response.json()
-                    pages = data.get("query", {}).get("pages", {})
-
-                    for page_id, page_info in pages.items():
-                        if page_id != "-1":  # Page found
-                            links = page_info.get("links", [])
-                            # Filter for human-related titles
-                            human_links = [link["title"] for link in links if is_probably_human(link["title"])]
-                            all_titles.extend(human_links)
+                    data = orjson.loads(response.content)
+                    if data.get("error", {}).get("code") == "maxlag":
+                        maxlag_retries += 1
+                        if maxlag_retries > MAXLAG_RETRIES:
+                            logger.error(f"Wikipedia API still lagging after {MAXLAG_RETRIES} retries for {day_title}")
+                            return []
+                        time.sleep(int(response.headers.get("Retry-After", 5)))
+                        continue  # Ask for the same page again
+
+                    pages = data.get("query", {}).get("pages", [])
+                    if plcontinue is None and pages:
+                        revision_id = pages[0].get("lastrevid")
+                        if cached_links and revision_id and cached_links["revid"] == revision_id:
+                            # The day's page hasn't been edited since its links were last read: skip the rest
+                            all_titles = cached_links["titles"]
+                            break
+
+                    for page in pages:
+                        # Filter for human-related titles (a missing page just has no links)
+                        links = page.get("links", [])
+                        all_titles.extend(filter_human_titles([link["title"] for link in links]))
 
                     if "continue" in data and "plcontinue" in data["continue"]:
                         plcontinue = data["continue"]["plcontinue"]
                     else:
                         continue_query = False
+                        if revision_id:
+                            REDIS_CLIENT.set(
+                                revision_key,
+                                orjson.dumps({"revid": revision_id, "titles": all_titles}),
+                                ex=DAY_LINKS_EXPIRE_TIME,
+                            )
 
+            except requests.RequestException as e:
+                logger.error(f"Error fetching content for {day_title}: {e}")
+                return []
+            else:
                 logger.info(
                     f"Extracted {len(all_titles)} potential human-related links for {day_title}.",
                 )
-                get_human_details_in_batches.apply_async(args=(month, day, all_titles))
-
-                return f"Processed {day_title}, found {len(all_titles)} titles."
-
-            except requests.RequestException as e:
-                logger.error(f"Error fetching content for {day_title}: {e}")
-                return f"Error processing {day_title}: {e}"
+                REDIS_CLIENT.set(titles_key, orjson.dumps(all_titles), ex=DAY_TITLES_EXPIRE_TIME)
+                return all_titles
 
         finally:
-            REDIS_CLIENT.delete(lock_key)  # Release lock after task execution
+            RELEASE_LOCK_SCRIPT(keys=[lock_key], args=[token])  # Release lock after task execution
     else:
-        logger.info(f"Task already exists for {month} and {day}, skipping")
-        raise Ignore  # Ignore duplicate tasks
+        # Hand back what the other task fetched rather than raise Ignore: an ignored task never reports back, so
+        # the chord would never fire, and returning nothing would drop the day's titles from this run
+        logger.info(f"Task already exists for {month} and {day}, reusing its titles")
+        cached_titles = REDIS_CLIENT.get(titles_key)
+        return orjson.loads(cached_titles) if cached_titles else []
+
+
+def acquire_or_wait(key, token, ttl):
+    """
+    Single-flight lock: take the lock with this task's token, or wait (for at most its ttl) for the task holding it
+    to release it. Returns True if the lock was taken, False once the other task has finished.
+    """
+    if REDIS_CLIENT.set(key, token, ex=ttl, nx=True):
+        return True
+
+    deadline = time.monotonic() + ttl
+    while REDIS_CLIENT.exists(key) and time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+    return False
 
 
 def is_probably_human(title):
@@ -115,232 +294,287 @@ def is_probably_human(title):
     Determines if a Wikipedia title likely refers to a human based on keywords
     and number patterns.
     """
+    return not NON_HUMAN_TITLE_RE.search(title)
+
 
-    # Exclude titles with specific prefixes or generic terms
-    non_human_keywords = [
-        "Category:",
-        "Template:",
-        "Template talk:",
-        "File:",
-        "Talk:",
-        "List of",
-        "Portal:",
-        "Wikipedia:",
-    ]
-    # Check if the title starts or ends with a number
-    if title.lstrip().startswith(tuple("0123456789")) or title.rstrip().endswith(
-        tuple("0123456789"),
-    ):
-        # Allow titles with parentheses for birth-death years
-        if not title.endswith(")"):
-            return False
-
-    # Exclude titles containing specific keywords
-    return all(keyword.lower() not in title.lower() for keyword in non_human_keywords)
+def filter_human_titles(titles):
+    """
+    Keep the titles that likely refer to humans, scanning each one once with the combined heuristics.
+    """
+    search = NON_HUMAN_TITLE_RE.search
+    return [title for title in titles if not search(title)]
 
 
 @shared_task(rate_limit=RATE_LIMIT)
-def get_human_details_in_batches(month, day, titles):
+def get_human_details_in_batches(titles_per_day):
     """
     Batch process titles and schedule SPARQL queries.
+    Runs as the chord callback for the days scheduled together, so it gets one list of titles per day.
     """
+    # Union the days' titles first (a person is linked from both their birth and death days), then sort so the
+    # same titles always land in the same full batches, whatever order the links came in: each batch then builds
+    # an identical SPARQL query, hitting the same lock and cache keys on every run
+    titles = sorted(set(chain.from_iterable(titles_per_day)))
+
+    # Drop titles recently found not to be humans, with one round trip for all of them
+    if titles:
+        cutoff = time.time() - NON_HUMAN_TITLE_EXPIRE_TIME
+        scores = REDIS_CLIENT.zmscore(NON_HUMAN_TITLES_KEY, titles)
+        titles = [title for title, score in zip(titles, scores, strict=True) if score is None or score < cutoff]
+
     # Split titles into batches
-    batches = [titles[i : i + BATCH_SIZE] for i in range(0, len(titles), BATCH_SIZE)]
+    batches = [titles[i : i + SPARQL_BATCH_SIZE] for i in range(0, len(titles), SPARQL_BATCH_SIZE)]
     task_id = str(int(time.time()))  # Unique ID for this execution
 
-    # Store the number of batches in Redis
-    REDIS_CLIENT.set(f"wiki_batches:{task_id}", len(batches))
+    # Generate a unique hash for each batch
+    batch_hashes = [get_batch_hash(batch) for batch in batches]
 
-    # Schedule tasks for each batch
-    batch_count = 1
-    for batch in batches:
-        # Generate a unique hash for this batch
-        batch_hash = hashlib.sha256(json.dumps(batch, sort_keys=True).encode()).hexdigest()
-        lock_key = f"batch_task:{batch_hash}"  # :{int(time.time() // 60)}
+    # Try to set every batch lock in one round trip (if a key exists, that batch is already processing).
+    # The lock holds the owning task's id so only that task releases it once the batch is done.
+    pipe = REDIS_CLIENT.pipeline(transaction=False)
+    for batch_hash in batch_hashes:
+        pipe.set(f"batch_task:{batch_hash}", task_id, ex=BATCH_LOCK_EXPIRE_TIME, nx=True)
+    locked = pipe.execute()
 
-        # Try to set lock (if key exists, batch is already processing)
-        if not REDIS_CLIENT.set(lock_key, "processing", ex=LOCK_EXPIRE_TIME, nx=True):
+    batch_tasks = []
+    for batch, batch_hash, acquired in zip(batches, batch_hashes, locked, strict=True):
+        if not acquired:
             logger.info(f"Batch already scheduled: skipping {batch_hash}")
             continue
 
-        get_human_details.apply_async(args=(month, day, batch, task_id))
-        batch_count += 1
+        batch_tasks.append(get_human_details.s(batch, task_id))
+
+    # Store the number of batches this run owns in Redis: each of its tasks decrements it once done, while skipped
+    # batches are counted (and released) by the run that scheduled them
+    REDIS_CLIENT.set(f"wiki_batches:{task_id}", len(batch_tasks))
+
+    # Publish every batch task in one go rather than one apply_async round trip per batch
+    if batch_tasks:
+        group(batch_tasks).apply_async()
+
+    logger.info(f"Started processing {len(batch_tasks)} batches. Task ID: {task_id}")
+
 
-    logger.info(f"Started processing {len(batches)} batches for {month} {day}. Task ID: {task_id}")
+def get_batch_hash(titles):
+    """Generate a lock key hash for a batch of titles (joined rather than JSON-encoded, hashed with BLAKE2b)."""
+    return hashlib.blake2b("\x00".join(titles).encode(), digest_size=16).hexdigest()
 
 
-def get_query_lock_key(query):
-    """Generate a unique lock key for each SPARQL query."""
-    return f"sparql_lock:{hashlib.sha256(query.encode()).hexdigest()}"  # {int(time.time() // 60)}
+def get_sparql_rows(query):
+    """
+    POST a SPARQL query to Wikidata over the shared session, keeping its connection alive between batches.
+    The bindings are parsed straight off the HTTP response rather than reading the whole body into memory first,
+    and each one is flattened into a {variable: value} row (unbound OPTIONAL variables are simply absent), so
+    the rows are cheap to read and to cache in Redis, letting a retry of the same batch skip the round trip.
+    """
+    cache_key = f"sparql_rows:{get_query_hash(query)}"
+    cached = REDIS_CLIENT.get(cache_key)
+    if cached is not None:
+        return orjson.loads(cached)
+
+    with session.post(
+        WIKIDATA_SPARQL_ENDPOINT,
+        data={"query": query},
+        headers={"Accept": "application/sparql-results+json"},
+        timeout=60,
+        stream=True,
+    ) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True  # Let urllib3 undo any gzip transfer encoding while ijson reads
+        rows = [
+            {variable: binding["value"] for variable, binding in result.items()}
+            for result in ijson.items(response.raw, "results.bindings.item")
+        ]
+
+    serialized = orjson.dumps(rows)
+    if len(serialized) <= SPARQL_CACHE_MAX_BYTES:
+        REDIS_CLIENT.set(cache_key, serialized, ex=SPARQL_CACHE_EXPIRE_TIME)
+    return rows
+
+
+def get_unmatched_titles(titles, rows):
+    """
+    Titles of a batch that a successful SPARQL query returned no row for.
+    """
+    found_articles = {result["article"] for result in rows}
+    # The query only matches its VALUES IRIs exactly, so each row's article is one of the IRIs it was sent
+    return [title for title in titles if get_article_uri(title)[1:-1] not in found_articles]
 
 
-def chunk_optional_fields(n):
-    """Yield successive n-sized chunks from lst."""
-    for i in range(0, len(ATTRIBUTE_CHOICES), n):
-        yield ATTRIBUTE_CHOICES[i : i + n]
+def remember_non_human_titles(titles, rows):
+    """
+    Record the titles of a batch that a successful SPARQL query returned no human for, so later runs skip them.
+    Only pass titles that went through the schema:about lookup: a stored human's title must never be skipped.
+    """
+    non_human_titles = get_unmatched_titles(titles, rows)
+    if non_human_titles:
+        recorded_at = time.time()
+        pipe = REDIS_CLIENT.pipeline(transaction=False)
+        pipe.zadd(NON_HUMAN_TITLES_KEY, dict.fromkeys(non_human_titles, recorded_at))
+        pipe.zremrangebyscore(NON_HUMAN_TITLES_KEY, "-inf", recorded_at - NON_HUMAN_TITLE_EXPIRE_TIME)
+        pipe.execute()
 
 
-@shared_task(rate_limit=RATE_LIMIT, time_limit=120, soft_time_limit=100)
-def get_human_details(month, day, titles, task_id):
+def get_query_hash(query):
+    """Hash a SPARQL query with BLAKE2b, so identical queries share their cache key."""
+    return hashlib.blake2b(query.encode(), digest_size=16).hexdigest()
+
+
+@shared_task(rate_limit=RATE_LIMIT, time_limit=120, soft_time_limit=100, acks_late=True, reject_on_worker_lost=True)
+def get_human_details(titles, task_id):
     max_retries = 5
     base_delay = 2
     """
     Query Wikidata SPARQL endpoint for human details for a batch of titles.
     """
     # Generate a unique hash for this batch
-    batch_hash = hashlib.sha256(json.dumps(titles, sort_keys=True).encode()).hexdigest()
-    lock_key = f"human_details_task:{batch_hash}"  # {int(time.time() // 60)}
+    batch_hash = get_batch_hash(titles)
+    lock_key = f"human_details_task:{batch_hash}"
+    token = uuid4().hex
 
-    if not REDIS_CLIENT.set(lock_key, "processing", ex=LOCK_EXPIRE_TIME, nx=True):
+    if not REDIS_CLIENT.set(lock_key, token, ex=LOCK_EXPIRE_TIME, nx=True):
         logger.info(f"Human details batch already processing: skipping {batch_hash}")
         return
 
+    # One timestamp for the whole batch: it stamps every row written below
+    started_at = now()
     # Anything updated within this time is "recent" and will not get updated
-    two_minutes_ago = now() - timedelta(minutes=2)
-    one_minute_ago = now() - timedelta(minutes=1)
-
-    humans_to_create_dict = {}
-    humans_to_update_dict = {}
-    existing_humans = {h.wikidata_id: h for h in NotableHuman.objects.all()}
-    recently_updated_humans = NotableHuman.objects.filter(
-        last_wikidata_update__gte=two_minutes_ago, last_wikidata_update__lt=one_minute_ago
-    )
-    recent_human_ids = set(recently_updated_humans.values_list("wikidata_id", flat=True))
+    two_minutes_ago = started_at - timedelta(minutes=2)
+    one_minute_ago = started_at - timedelta(minutes=1)
+
+    humans_to_upsert_dict = {}  # New and existing humans alike, written with one INSERT ... ON CONFLICT DO UPDATE
+    recent_human_ids = set()  # Filled from each result set with a single IN query
 
     places_to_create = {}
-    existing_places = {p.wikidata_id: p for p in Place.objects.all()}
-    recently_updated_places = Place.objects.filter(last_updated__gte=two_minutes_ago)
-    recent_place_ids = set(recently_updated_places.values_list("wikidata_id", flat=True))
-
-    attributes_to_create = {}
-    existing_attributes = {a.wikidata_id: a for a in NotableHumanAttribute.objects.all()}
-    recently_updated_attributes = NotableHumanAttribute.objects.filter(last_updated__gte=two_minutes_ago)
-    recent_attribute_ids = set(recently_updated_attributes.values_list("wikidata_id", flat=True))
+    places_to_update = {}
+    existing_places = {}  # Filled from each result set with a single IN query
+    recent_place_ids = set()  # Worked out from the same query's last_updated
+
+    # New and existing attributes alike: bulk_upsert only rewrites rows whose label or category changed
+    attributes_to_upsert = {}
     try:
-        is_first_batch = True
-
-        for attribute_batch in chunk_optional_fields(OPTIONAL_FIELD_BATCH_SIZE):
-            sparql_query = NotableHuman.get_sparql_query(titles, attribute_batch, is_first_batch)
-
-            query_lock_key = get_query_lock_key(sparql_query)
-
-            # Prevent duplicate queries from running simultaneously
-            if not REDIS_CLIENT.set(query_lock_key, "locked", ex=60, nx=True):
-                logger.info(f"Query already in progress with : {titles}")
-                return
-
-            sparql = SPARQLWrapper(WIKIDATA_SPARQL_ENDPOINT)
-            sparql.setReturnFormat(JSON)
-            sparql.setQuery(sparql_query)
-            sparql.method = "POST"
-            sparql.addCustomHttpHeader("User-Agent", "NotableHumans/1.0 (mailto:jcmeyer23@gmail.com)")
-
-            for attempt in range(max_retries):
-                try:
-                    results = sparql.query().convert()
-                    time.sleep(random.uniform(0.8, 1.4))
-                    for result in results["results"]["bindings"]:
-                        wikidata_id = result["item"]["value"].split("/")[-1]
-                        if wikidata_id and wikidata_id in recent_human_ids:
-                            continue
-
-                        # Parse main fields
-                        name = result["itemLabel"]["value"]
-                        human_data = {"name": name}
-                        if is_first_batch:
-                            raw_url = result.get("article", {}).get("value")
-                            wikipedia_url = raw_url.rsplit("/", 1)[-1] if raw_url else ""
-                            birth_date, is_birth_bc = NotableHuman.parse_date(
-                                result.get("dobValues", {}).get("value"), result.get("dobStatements", {}).get("value")
-                            )
-                            death_date, is_death_bc = NotableHuman.parse_date(
-                                result.get("dodValues", {}).get("value"), result.get("dodStatements", {}).get("value")
-                            )
-                            human_data.update(
-                                {
-                                    "wikipedia_url": wikipedia_url,
-                                    "birth_date": birth_date,
-                                    "is_birth_bc": is_birth_bc,
-                                    "death_date": death_date,
-                                    "is_death_bc": is_death_bc,
-                                    "birth_place_id": result.get("birthPlaceID", {}).get("value"),
-                                    "death_place_id": result.get("deathPlaceID", {}).get("value"),
-                                }
-                            )
-                            # Parse and store places
-                            places_to_create.update(Place.parse_and_update(result, recent_place_ids, existing_places))
-
-                        attribute_ids = []
-                        for attribute_choice in ATTRIBUTE_CHOICES:
-                            # Needs to ensure that the attribute_choice matches the field in the SPARQL query
-                            attr_data = result.get(attribute_choice, {}).get("value")
-                            if attr_data:
-                                for attr_pair in attr_data.split("@@"):
-                                    attr_id, attr_label = attr_pair.split("||")
-                                    if attr_id:
-                                        attribute_ids.append(attr_id)
-                                        if attr_id not in recent_attribute_ids:
-                                            category_value = AttributeType(attribute_choice).value
-                                            if attr_id in existing_attributes:
-                                                # Update existing attribute
-                                                attribute = existing_attributes[attr_id]
-                                                if (
-                                                    attribute.label != attr_label
-                                                    or attribute.category != category_value
-                                                ):
-                                                    attribute.label = attr_label
-                                                    attribute.category = category_value
-                                                    attribute.last_updated = now()  # Mark as updated
-                                                    attribute.save()
-                                            elif attr_id not in attributes_to_create:
-                                                # Prepare new gender for creation
-                                                attributes_to_create[attr_id] = NotableHumanAttribute(
-                                                    wikidata_id=attr_id, label=attr_label, category=category_value
-                                                )
-
-                        if wikidata_id in existing_humans:
-                            # Update existing human
-                            human = existing_humans[wikidata_id]
-                            if human not in humans_to_update_dict:
-                                humans_to_update_dict[human] = human_data
-                                humans_to_update_dict[human]["attributes"] = attribute_ids
-                            else:
-                                humans_to_update_dict[human].update(human_data)
-                                humans_to_update_dict[human]["attributes"] += attribute_ids
-                        elif wikidata_id not in humans_to_create_dict:
-                            # Create new human
-                            if wikidata_id not in humans_to_create_dict:
-                                humans_to_create_dict[wikidata_id] = human_data
-                                humans_to_create_dict[wikidata_id]["attributes"] = attribute_ids
-                            else:
-                                humans_to_create_dict[wikidata_id].update(human_data)
-                                humans_to_create_dict[wikidata_id]["attributes"] += attribute_ids
-
-                except QueryBadFormed as e:
+        # The query is built from the titles (and items already known for them), so the batch lock above already
+        # keeps duplicates from running
+        known_items = NotableHuman.get_known_items(titles)
+        sparql_query = NotableHuman.get_sparql_query(titles, known_items)
+
+        for attempt in range(max_retries):
+            try:
+                rows = get_sparql_rows(sparql_query)
+                # A stored item that no longer owns its article (merged away, or the sitelink moved to another item)
+                # returns no row, so look those titles up again by article to find the item that owns it now
+                stale_titles = get_unmatched_titles(known_items, rows)
+                if stale_titles:
+                    rows = [*rows, *get_sparql_rows(NotableHuman.get_sparql_query(stale_titles))]
+                time.sleep(random.uniform(0.8, 1.4))
+                human_ids = {result["item"].rsplit("/", 1)[-1] for result in rows}
+                recent_human_ids.update(
+                    NotableHuman.objects.filter(
+                        wikidata_id__in=human_ids,
+                        last_wikidata_update__gte=two_minutes_ago,
+                        last_wikidata_update__lt=one_minute_ago,
+                    ).values_list("wikidata_id", flat=True)
+                )
+                # Look up every place referenced by this result set in one query
+                place_ids = {
+                    result[key] for result in rows for key in ("birthPlaceID", "deathPlaceID") if key in result
+                }
+                found_places = Place.objects.in_bulk(place_ids - existing_places.keys())
+                existing_places.update(found_places)
+                recent_place_ids.update(
+                    wikidata_id for wikidata_id, place in found_places.items() if place.last_updated >= two_minutes_ago
+                )
+                for result in rows:
+                    wikidata_id = result["item"].split("/")[-1]
+                    if wikidata_id and wikidata_id in recent_human_ids:
+                        continue
+
+                    # Parse main fields
+                    raw_url = result.get("article")
+                    birth_date, is_birth_bc = NotableHuman.parse_date(
+                        result.get("dobValues"), result.get("dobStatements")
+                    )
+                    death_date, is_death_bc = NotableHuman.parse_date(
+                        result.get("dodValues"), result.get("dodStatements")
+                    )
+                    human_data = {
+                        "name": result["itemLabel"],
+                        "wikipedia_url": raw_url.rsplit("/", 1)[-1] if raw_url else "",
+                        "birth_date": birth_date,
+                        "is_birth_bc": is_birth_bc,
+                        "death_date": death_date,
+                        "is_death_bc": is_death_bc,
+                        "birth_place_id": result.get("birthPlaceID"),
+                        "death_place_id": result.get("deathPlaceID"),
+                    }
+                    # Parse and store places
+                    new_places, changed_places = Place.parse_and_update(
+                        result, recent_place_ids, existing_places, started_at
+                    )
+                    places_to_create.update(new_places)
+                    places_to_update.update(changed_places)
+
+                    attribute_ids = []
+                    # ATTRIBUTE_CHOICES already holds the AttributeType values, so each one is used as the
+                    # category directly rather than going through the enum for every attribute
+                    for attribute_choice in ATTRIBUTE_CHOICES:
+                        # Needs to ensure that the attribute_choice matches the field in the SPARQL query
+                        attr_value = result.get(attribute_choice)
+                        if attr_value:
+                            for attr_id, attr_label in ATTRIBUTE_PAIR_RE.findall(attr_value):
+                                if attr_id:
+                                    attribute_ids.append(attr_id)
+                                    if attr_id not in attributes_to_upsert:
+                                        attributes_to_upsert[attr_id] = NotableHumanAttribute(
+                                            wikidata_id=attr_id,
+                                            label=attr_label,
+                                            category=attribute_choice,
+                                            last_updated=started_at,
+                                        )
+
+                    if wikidata_id not in humans_to_upsert_dict:
+                        humans_to_upsert_dict[wikidata_id] = human_data
+                        humans_to_upsert_dict[wikidata_id]["attributes"] = attribute_ids
+                    else:
+                        humans_to_upsert_dict[wikidata_id].update(human_data)
+                        humans_to_upsert_dict[wikidata_id]["attributes"] += attribute_ids
+
+                # Leave out attributes another batch wrote moments ago, looking up only this batch's ids
+                recent_attribute_ids = NotableHumanAttribute.objects.filter(
+                    wikidata_id__in=list(attributes_to_upsert), last_updated__gte=two_minutes_ago
+                ).values_list("wikidata_id", flat=True)
+                for attr_id in recent_attribute_ids:
+                    del attributes_to_upsert[attr_id]
+
+                # Titles already backed by a stored human keep being refreshed even when their item returns no row
+                remember_non_human_titles([title for title in titles if title not in known_items], rows)
+                break  # Results processed, so don't run the query again
+
+            except requests.HTTPError as e:
+                if e.response.status_code == HTTPStatus.BAD_REQUEST:
                     logger.error(f"SPARQL query malformed {e}")
                     break  # Don't retry if the query itself is incorrect
-                except Exception as e:
-                    if "429" in str(e):
-                        retry_after = base_delay * (2**attempt)  # Exponential backoff
-                        logger.info(f"Rate limit hit. Retrying in {retry_after} seconds...")
-                        time.sleep(retry_after)
-                        continue
+                if e.response.status_code != HTTPStatus.TOO_MANY_REQUESTS:
                     logger.error(f"SPARQL query failed: {e}")
                     break
-            is_first_batch = False
-            time.sleep(1)  # To avoid hammering endpoint with batches back to back
+                retry_after = base_delay * (2**attempt)  # Exponential backoff
+                logger.info(f"Rate limit hit. Retrying in {retry_after} seconds...")
+                time.sleep(retry_after)
+            except Exception as e:
+                logger.error(f"SPARQL query failed: {e}")
+                break
 
         # Perform bulk operations inside a transaction
         try:
             with transaction.atomic():
-                Place.objects.bulk_create(places_to_create.values(), ignore_conflicts=True)
-                existing_places = {p.wikidata_id: p for p in Place.objects.all()}
+                # Every place referenced below now exists: it was either upserted here or skipped as recent
+                Place.objects.bulk_upsert([*places_to_create.values(), *places_to_update.values()])
 
-                NotableHumanAttribute.objects.bulk_create(attributes_to_create.values(), ignore_conflicts=True)
-                existing_attributes = {a.wikidata_id: a for a in NotableHumanAttribute.objects.all()}
+                # Every attribute referenced below now exists: it was either upserted here or skipped as recent
+                NotableHumanAttribute.objects.bulk_upsert(attributes_to_upsert.values())
 
-                humans_to_create = []
-                for wikidata_id, human_data in humans_to_create_dict.items():
+                humans_to_upsert = []
+                for wikidata_id, human_data in humans_to_upsert_dict.items():
                     human = NotableHuman(
                         wikidata_id=wikidata_id,
                         name=human_data["name"],
@@ -349,101 +583,54 @@ def get_human_details(month, day, titles, task_id):
                         is_birth_bc=human_data["is_birth_bc"],
                         death_date=human_data["death_date"],
                         is_death_bc=human_data["is_death_bc"],
-                        birth_place=existing_places.get(human_data["birth_place_id"])
-                        if human_data["birth_place_id"]
-                        else None,
-                        death_place=existing_places.get(human_data["death_place_id"])
-                        if human_data["death_place_id"]
-                        else None,
-                        last_wikidata_update=now(),
-                    )
-                    humans_to_create.append(human)
-                NotableHuman.objects.bulk_create(humans_to_create, ignore_conflicts=True)
-                # if humans_to_create:
-                #     logger.info(f"
-                #     {month} {day}: Created {len(humans_to_create)} humans including {humans_to_create[0]}")
-
-                # Map wikidata_id to actual NotableHuman instances
-                humans_created_id_map = {
-                    h.wikidata_id: h for h in NotableHuman.objects.filter(wikidata_id__in=humans_to_create_dict.keys())
-                }
-
-                # Handle ManyToMany: Attributes ↔ Humans
-                human_attribute_relations = []
-                for wikidata_id, human_data in humans_to_create_dict.items():
-                    human = humans_created_id_map.get(wikidata_id)
-                    if human:
-                        for attr_id in human_data["attributes"]:
-                            attribute = existing_attributes.get(attr_id)
-                            if attribute:
-                                human_attribute_relations.append(
-                                    human.attributes.through(notablehuman=human, notablehumanattribute=attribute)
-                                )
-
-                # Bulk create attribute relationships
-                NotableHuman.attributes.through.objects.bulk_create(human_attribute_relations, ignore_conflicts=True)
-
-                humans_to_update = []
-                for human, human_data in humans_to_update_dict.items():
-                    human.name = human_data["name"]
-                    human.wikipedia_url = human_data["wikipedia_url"]
-                    human.birth_date = human_data["birth_date"]
-                    human.is_birth_bc = human_data["is_birth_bc"]
-                    human.death_date = human_data["death_date"]
-                    human.is_death_bc = human_data["is_death_bc"]
-                    human.birth_place = (
-                        existing_places.get(human_data["birth_place_id"]) if human_data["birth_place_id"] else None
+                        birth_place_id=human_data["birth_place_id"],
+                        death_place_id=human_data["death_place_id"],
+                        last_wikidata_update=started_at,
                     )
-                    human.death_place = (
-                        existing_places.get(human_data["death_place_id"]) if human_data["death_place_id"] else None
-                    )
-                    human.last_wikidata_update = now()
-                    humans_to_update.append(human)
-
-                # Perform bulk update
-                NotableHuman.objects.bulk_update(
-                    humans_to_update,
-                    fields=[
+                    human.set_years()  # bulk_create doesn't call save()
+                    humans_to_upsert.append(human)
+
+                # Create new humans and update existing ones in one statement per batch; every human exists after it
+                NotableHuman.objects.bulk_create(
+                    humans_to_upsert,
+                    batch_size=500,
+                    update_conflicts=True,
+                    unique_fields=["wikidata_id"],
+                    update_fields=[
                         "name",
                         "wikipedia_url",
                         "birth_date",
                         "is_birth_bc",
+                        "birth_year",
                         "death_date",
                         "is_death_bc",
+                        "death_year",
                         "birth_place",
                         "death_place",
                         "last_wikidata_update",
                     ],
                 )
-                # if humans_to_update:
-                #     logger.info(f"
-                #     {month} {day}: Updated {len(humans_to_update)} humans including {humans_to_update[0]}")
-
-                # Handle ManyToMany: Attributes ↔ Updated Humans
-                for human, human_data in humans_to_update_dict.items():
-                    attribute_objs = [
-                        existing_attributes[attr_id]
-                        for attr_id in human_data["attributes"]
-                        if attr_id in existing_attributes
-                    ]
-                    human.attributes.add(*attribute_objs)  # This ensures the M2M field is updated
+
+                # Handle ManyToMany: resync Attributes ↔ upserted humans with one delete and one bulk insert
+                NotableHuman.bulk_set_attributes(
+                    {wikidata_id: human["attributes"] for wikidata_id, human in humans_to_upsert_dict.items()}
+                )
 
         except Exception as e:
             logger.error(f"Transaction failed: {e}")
     except Exception as e:
         logger.error(f"Error in get_human_details: {e}")
     finally:
-        REDIS_CLIENT.delete(lock_key)  # Release lock after processing
-
-        # Decrement the batch counter
-        remaining = REDIS_CLIENT.decr(f"wiki_batches:{task_id}")
+        # Release locks after processing and decrement the batch counter, atomically in one round trip
+        remaining = RELEASE_BATCH_SCRIPT(
+            keys=[lock_key, f"wiki_batches:{task_id}", f"batch_task:{batch_hash}"], args=[task_id, token]
+        )
 
         # Log when all batches are done
         if remaining > 0:
-            logger.info(f"{remaining} batches left for {month} {day} to process for task {task_id}.")
+            logger.info(f"{remaining} batches left to process for task {task_id}.")
         else:
-            logger.info(f"### ALL BATCHES COMPLETE for {month} {day} task {task_id}! ###")
-            # logger.info(f"Batch {batch_count} out of {num_batches} complete for {month} {day} task {task_id}!")
+            logger.info(f"### ALL BATCHES COMPLETE for task {task_id}! ###")
 
 
 @shared_task
@@ -452,36 +639,29 @@ def schedule_wikidata_data_collection():
     Schedule tasks to fetch Wikipedia article content for all days of the year
     using the Wikipedia API.
     """
-    tasks = []
-    for month in [
-        "January",
-        "February",
-        "March",
-        "April",
-        "May",
-        "June",
-        "July", "August", "September", "October", "November", "December"
-    ]:
-        daily_tasks = []
-        for day in range(1, 32):
-            lock_key = f"wiki_task:{month}:{day}"
-            # Check if a task is already scheduled
-            if REDIS_CLIENT.exists(lock_key):
-                logger.info(f"Skipping {month} {day}, already scheduled.")
-                continue  # Skip duplicate tasks
-
-            delay_seconds = random.randint(0, 600)  # delay up to 10 minutes
-            daily_tasks.append(get_linked_titles_from_day.s(month, day))
-
-        if daily_tasks:
-            # Add the month's tasks as a group of tasks to month_tasks
-            tasks.append(group(daily_tasks))  # Group the tasks for this month
-
-    if tasks:
-        # Distribute tasks as a group
-        group(*tasks).apply_async()  # Apply all month groups simultaneously
-
-    return "Scheduled fetching tasks for all days of the year by month."
+    days = [(month, day) for month in MONTHS for day in range(1, 32)]
+
+    # Check every day's lock in one round trip
+    pipe = REDIS_CLIENT.pipeline(transaction=False)
+    for month, day in days:
+        pipe.exists(f"wiki_task:{month}:{day}")
+    already_scheduled = pipe.execute()
+
+    daily_tasks = []
+    for (month, day), scheduled in zip(days, already_scheduled, strict=True):
+        # Check if a task is already scheduled
+        if scheduled:
+            logger.info(f"Skipping {month} {day}, already scheduled.")
+            continue  # Skip duplicate tasks
+
+        daily_tasks.append(get_linked_titles_from_day.s(month, day))
+
+    if daily_tasks:
+        # Fetch every day at once, then batch all of their titles together: deduped across the whole year, the
+        # batches come out fewer and full, so there are fewer SPARQL round trips under the rate limit
+        chord(group(daily_tasks))(get_human_details_in_batches.s())
+
+    return "Scheduled fetching tasks for all days of the year."
 
 
 @shared_task
@@ -499,10 +679,7 @@ def schedule_wikipedia_data_collection():
     logger.info(f"Total NotableHumans needing Wikipedia update: {humans_to_update.count()}")
 
     all_ids = list(humans_to_update.values_list("wikidata_id", flat=True))
-    batch_size = 50
-    human_ids_batches = [
-        all_ids[i: i + batch_size] for i in range(0, len(all_ids), batch_size)
-    ]
+    human_ids_batches = [all_ids[i : i + WIKIPEDIA_BATCH_SIZE] for i in range(0, len(all_ids), WIKIPEDIA_BATCH_SIZE)]
 
     # check for any missing
     scheduled_ids = {wid for batch in human_ids_batches for wid in batch}
@@ -519,122 +696,148 @@ def schedule_wikipedia_data_collection():
     group(*tasks).apply_async()
 
 
-@shared_task(time_limit=150, soft_time_limit=120)
+@shared_task(
+    rate_limit=WIKIPEDIA_BATCH_RATE_LIMIT,
+    time_limit=150,
+    soft_time_limit=120,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
 def process_wikipedia_batch(human_ids):
     humans = NotableHuman.objects.filter(wikidata_id__in=human_ids)
+    updated_humans = []
 
-    for human in humans:
-        try:
-            page_title = human.wikipedia_url.split("/")[-1]
-            scraped_page_title, metadata = fetch_wikipedia_metadata(page_title)
-
-            if metadata:
-                human.wikipedia_url = scraped_page_title
-                human.description = metadata.get("description")
-                human.article_length = metadata.get("page_length")
-                human.article_recent_views = metadata.get("page_views_30_days")
-                human.article_total_edits = metadata.get("edit_count")
-                human.article_recent_edits = metadata.get("recent_edits_30_days")
-                if metadata.get("good_article"):
-                    human.article_quality = NotableHuman.GOOD_ARTICLE
-                elif metadata.get("featured_article"):
-                    human.article_quality = NotableHuman.FEATURED_ARTICLE
-                human.article_created_date = metadata.get("created_date")
-                human.last_wikipedia_update = now()
-                human.save()
-                logger.info(f"Saved Wikipedia metadata for {human.wikipedia_url}")
-        except Exception as e:
-            logger.error(f"Error updating human {human.wikidata_id}: {e}")
-    time.sleep(2)
+    # Fetching an info page is nearly all network wait, so fetch the batch's pages side by side over the shared
+    # session's connection pool and apply each one as it comes back
+    executor = ThreadPoolExecutor(max_workers=WIKIPEDIA_FETCH_WORKERS)
+    try:
+        futures = {
+            executor.submit(fetch_wikipedia_metadata, human.wikipedia_url.split("/")[-1]): human for human in humans
+        }
+        for future in as_completed(futures):
+            human = futures[future]
+            try:
+                scraped_page_title, metadata = future.result()
+
+                if metadata:
+                    human.wikipedia_url = scraped_page_title
+                    human.description = metadata.get("description")
+                    human.article_length = metadata.get("page_length")
+                    human.article_recent_views = metadata.get("page_views_30_days")
+                    human.article_total_edits = metadata.get("edit_count")
+                    human.article_recent_edits = metadata.get("recent_edits_30_days")
+                    if metadata.get("good_article"):
+                        human.article_quality = NotableHuman.GOOD_ARTICLE
+                    elif metadata.get("featured_article"):
+                        human.article_quality = NotableHuman.FEATURED_ARTICLE
+                    human.article_created_date = metadata.get("created_date")
+                    human.last_wikipedia_update = now()
+                    updated_humans.append(human)
+            except Exception as e:
+                logger.error(f"Error updating human {human.wikidata_id}: {e}")
+    finally:
+        # If the soft time limit interrupts the batch, drop the pages not fetched yet but still write back the
+        # humans collected so far, in one UPDATE instead of a save() per human
+        executor.shutdown(wait=False, cancel_futures=True)
+        NotableHuman.objects.bulk_update(updated_humans, fields=WIKIPEDIA_METADATA_FIELDS, batch_size=100)
+        logger.info(f"Saved Wikipedia metadata for {len(updated_humans)} of {len(human_ids)} humans")
 
 
 def fetch_wikipedia_metadata(page_title):
     """
-    Fetches metadata from the Wikipedia Info page for a given page title.
+    Fetches metadata from the Wikipedia Info page for a given page title, following redirects to the final article.
     """
     page_title = page_title.split("#", 1)[0]
-    url = f"https://en.wikipedia.org/w/index.php?title={page_title.replace(' ', '_')}&action=info"
 
-    # Send a GET request to the Wikipedia Info page
-    response = requests.get(url, timeout=10)
+    # Follow redirects iteratively: each hop is one info page request, and a redirect loop can't recurse forever
+    for _ in range(WIKIPEDIA_MAX_REDIRECTS + 1):
+        url = f"https://en.wikipedia.org/w/index.php?title={page_title.replace(' ', '_')}&action=info"
 
-    if response.status_code == HTTPStatus.OK:
-        soup = BeautifulSoup(response.text, "html.parser")
+        # Send a GET request to the Wikipedia Info page over the shared keep-alive session
+        response = session.get(url, timeout=10)
+        if response.status_code != HTTPStatus.OK:
+            return page_title, None  # Return None if the page request fails
 
-        metadata = {}
+        # lxml builds the tree in C, several times faster than the pure-Python html.parser on these large pages
+        soup = BeautifulSoup(response.content, "lxml")
 
-        redirect_row = soup.find("tr", {"id": "mw-pageinfo-redirectsto"})
-        if redirect_row:
-            # If a redirect exists, extract the redirected article's title
-            redirect_link = redirect_row.find_all("td")[1].find("a")["href"]
-            redirected_page_title = redirect_link.split("/")[-1]
+        # Walk the table rows once and look rows up by id from here on instead of searching the tree again
+        rows = soup.find_all("tr")
+        rows_by_id = {row["id"]: row for row in rows if row.has_attr("id")}
 
-            # Fetch metadata from the redirected page
-            return fetch_wikipedia_metadata(redirected_page_title)
+        redirect_row = rows_by_id.get("mw-pageinfo-redirectsto")
+        if not redirect_row:
+            break
 
-        description = ""
-        for row in soup.find_all("tr"):
-            first_td = row.find("td")  # Get the first <td>
-            if first_td and "Central description" in first_td.text:
-                description_td = row.find_all("td")[1]  # Second <td> contains the description
-                description = description_td.text.strip()
-                break  # Stop after finding the first match
-        else:
-            for row in soup.find_all("tr"):
-                first_td = row.find("td")  # Get the first <td>
-                if first_td and "Local description" in first_td.text:
-                    description_td = row.find_all("td")[1]  # Second <td> contains the description
-                    description = description_td.text.strip()
-                    break  # Stop after finding the first match
-
-        metadata["description"] = description
-
-        # Check for the presence of the "Category:Good articles" link
-        good_articles_link = soup.find("a", {"title": "Category:Good articles"})
-        metadata["good_article"] = bool(good_articles_link)
-
-        # Check for the presence of the "Category:Featured articles" link
-        featured_articles_link = soup.find("a", {"title": "Category:Featured articles"})
-        metadata["featured_article"] = bool(featured_articles_link)
-
-        # Mapping of the IDs to metadata labels
-        metadata_ids = {
-            "mw-pageinfo-length": "page_length",
-            "mw-pvi-month-count": "page_views_30_days",
-            "mw-pageinfo-firsttime": "created_date",
-            "mw-pageinfo-edits": "edit_count",
-            "mw-pageinfo-recent-edits": "recent_edits_30_days",
-        }
+        # If a redirect exists, fetch the redirected article's info page instead
+        redirect_link = redirect_row.find_all("td")[1].find("a")["href"]
+        page_title = redirect_link.split("/")[-1].split("#", 1)[0]
+    else:
+        logger.warning(f"Too many redirects, giving up at {page_title}")
+        return page_title, None
+
+    metadata = {}
+
+    # Prefer the first "Central description" row, falling back to the first "Local description" row
+    description_rows = {}
+    for row in rows:
+        first_td = row.find("td")  # Get the first <td>
+        if first_td:
+            for label in ("Central description", "Local description"):
+                if label in first_td.text:
+                    description_rows.setdefault(label, row)
+    description_row = description_rows.get("Central description") or description_rows.get("Local description")
+    description = ""
+    if description_row:
+        description = description_row.find_all("td")[1].text.strip()  # Second <td> contains the description
+
+    metadata["description"] = description
+
+    # Check for the presence of the "Category:Good articles" link
+    good_articles_link = soup.find("a", {"title": "Category:Good articles"})
+    metadata["good_article"] = bool(good_articles_link)
+
+    # Check for the presence of the "Category:Featured articles" link
+    featured_articles_link = soup.find("a", {"title": "Category:Featured articles"})
+    metadata["featured_article"] = bool(featured_articles_link)
+
+    # Mapping of the IDs to metadata labels
+    metadata_ids = {
+        "mw-pageinfo-length": "page_length",
+        "mw-pvi-month-count": "page_views_30_days",
+        "mw-pageinfo-firsttime": "created_date",
+        "mw-pageinfo-edits": "edit_count",
+        "mw-pageinfo-recent-edits": "recent_edits_30_days",
+    }
+
+    # Loop through each id in the mapping and extract the data
+    for row_id, label in metadata_ids.items():
+        row = rows_by_id.get(row_id)
+        if not row:
+            logger.warning(f"No row for {row_id}")
+            continue
 
-        # Loop through each id in the mapping and extract the data
-        for row_id, label in metadata_ids.items():
-            row = soup.find("tr", {"id": row_id})
-            if not row:
-                logger.warning(f"No row for {row_id}")
-                continue
-
-            cells = row.find_all("td")
-            if len(cells) < 2:
-                logger.warning(f"Expected 2 <td> in {row_id}, found {len(cells)}")
-                continue
-
-            text = cells[1].get_text(strip=True)  # <<–– now the *value* cell
-
-            if label == "created_date":
-                try:
-                    dt = dateparser.parse(text)
-                    metadata[label] = make_aware(dt, get_default_timezone())
-                except (ParserError, ValueError, TypeError):
-                    logger.warning(f"Failed to parse date '{text}' in {row_id}")
-            else:
-                digits = re.sub(r"\D", "", text)
-                try:
-                    metadata[label] = int(digits)
-                except ValueError:
-                    logger.warning(f"No digits found in '{text}' for {row_id}")
+        cells = row.find_all("td")
+        if len(cells) < 2:
+            logger.warning(f"Expected 2 <td> in {row_id}, found {len(cells)}")
+            continue
+
+        text = cells[1].get_text(strip=True)  # <<–– now the *value* cell
+
+        if label == "created_date":
+            try:
+                dt = dateparser.parse(text)
+                metadata[label] = make_aware(dt, get_default_timezone())
+            except (ParserError, ValueError, TypeError):
+                logger.warning(f"Failed to parse date '{text}' in {row_id}")
+        else:
+            digits = NON_DIGIT_RE.sub("", text)
+            try:
+                metadata[label] = int(digits)
+            except ValueError:
+                logger.warning(f"No digits found in '{text}' for {row_id}")
 
-        return page_title, metadata
-    return page_title, None  # Return None if the page request fails
+    return page_title, metadata
 
 
 @shared_task
@@ -647,7 +850,7 @@ def reprocess_missing_created_dates():
     )
 
     # 2) Split into batches
-    batches = [qids[i : i + BATCH_SIZE] for i in range(0, len(qids), BATCH_SIZE)]
+    batches = [qids[i : i + WIKIPEDIA_BATCH_SIZE] for i in range(0, len(qids), WIKIPEDIA_BATCH_SIZE)]
 
     # 3) Fire off one process_wikipedia_batch job per batch
     job = group(process_wikipedia_batch.s(batch) for batch in batches)
@@ -0,0 +1,113 @@
+import gzip
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from notablehumans.data_collection.api.views import NotableHumansGeoJSONSeqViewSet
+from notablehumans.data_collection.api.views import NotableHumansGeoJSONViewSet
+
+
+class NotableHumansGeoJSONViewSetTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        geojson_dir = Path(self.tmp_dir.name) / "notablehumans" / "data_collection" / "management"
+        geojson_dir.mkdir(parents=True)
+        self.geojson = b'{"type":"FeatureCollection","features":[]}'
+        self.geojson_path = geojson_dir / "notable_humans.geojson"
+        self.geojson_path.write_bytes(self.geojson)
+        self.view = NotableHumansGeoJSONViewSet.as_view({"get": "list"})
+        self.factory = APIRequestFactory()
+
+    def test_returns_exported_bytes_with_etag(self):
+        with override_settings(BASE_DIR=self.tmp_dir.name):
+            response = self.view(self.factory.get("/api/notable-humans-geojson/"))
+
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        content = b"".join(response.streaming_content)
+        assert content == self.geojson, f"Expected the exported bytes, got {content!r}"
+        assert response["ETag"], "Expected an ETag header on the GeoJSON response"
+        assert not response.has_header("Content-Encoding"), "Expected the uncompressed file without gzip on disk"
+
+    def test_serves_gzip_copy_when_accepted(self):
+        gzip_path = self.geojson_path.with_name("notable_humans.geojson.gz")
+        gzip_path.write_bytes(gzip.compress(self.geojson))
+
+        with override_settings(BASE_DIR=self.tmp_dir.name):
+            response = self.view(self.factory.get("/api/notable-humans-geojson/", HTTP_ACCEPT_ENCODING="gzip, br"))
+
+        content = gzip.decompress(b"".join(response.streaming_content))
+        assert response["Content-Encoding"] == "gzip", (
+            f"Expected gzip encoding, got {response.get('Content-Encoding')}"
+        )
+        assert content == self.geojson, f"Expected the exported bytes once decompressed, got {content!r}"
+
+    def test_skips_encodings_refused_with_zero_qvalue(self):
+        self.geojson_path.with_name("notable_humans.geojson.gz").write_bytes(gzip.compress(self.geojson))
+        self.geojson_path.with_name("notable_humans.geojson.br").write_bytes(b"brotli-bytes")
+
+        with override_settings(BASE_DIR=self.tmp_dir.name):
+            gzip_only = self.view(
+                self.factory.get("/api/notable-humans-geojson/", HTTP_ACCEPT_ENCODING="gzip, br;q=0")
+            )
+            refused = self.view(
+                self.factory.get("/api/notable-humans-geojson/", HTTP_ACCEPT_ENCODING="br;q=0, gzip;q=0.0")
+            )
+
+        assert gzip_only["Content-Encoding"] == "gzip", (
+            f"Expected gzip with br refused, got {gzip_only.get('Content-Encoding')}"
+        )
+        assert not refused.has_header("Content-Encoding"), "Expected the plain file when every encoding is refused"
+        assert b"".join(refused.streaming_content) == self.geojson, "Expected the uncompressed bytes"
+
+    def test_prefers_brotli_copy_with_its_own_etag(self):
+        self.geojson_path.with_name("notable_humans.geojson.gz").write_bytes(gzip.compress(self.geojson))
+        self.geojson_path.with_name("notable_humans.geojson.br").write_bytes(b"brotli-bytes")
+
+        with override_settings(BASE_DIR=self.tmp_dir.name):
+            plain = self.view(self.factory.get("/api/notable-humans-geojson/"))
+            response = self.view(self.factory.get("/api/notable-humans-geojson/", HTTP_ACCEPT_ENCODING="gzip, br"))
+
+        assert response["Content-Encoding"] == "br", f"Expected br encoding, got {response.get('Content-Encoding')}"
+        assert b"".join(response.streaming_content) == b"brotli-bytes", "Expected the brotli copy to be served"
+        assert response["ETag"] != plain["ETag"], "Expected encoded responses to carry a distinct ETag"
+
+    def test_matching_etag_returns_not_modified(self):
+        with override_settings(BASE_DIR=self.tmp_dir.name):
+            original = self.view(self.factory.get("/api/notable-humans-geojson/"))
+            etag = original["ETag"]
+            response = self.view(self.factory.get("/api/notable-humans-geojson/", HTTP_IF_NONE_MATCH=etag))
+
+        assert response.status_code == 304, f"Expected 304, got {response.status_code}"
+        assert response.get("ETag") == etag, f"Expected the 304 to carry the ETag, got {response.get('ETag')}"
+        assert response.get("Last-Modified") == original["Last-Modified"], (
+            f"Expected the 304 to carry Last-Modified, got {response.get('Last-Modified')}"
+        )
+
+    def test_missing_file_returns_404(self):
+        with override_settings(BASE_DIR=Path(self.tmp_dir.name) / "missing"):
+            response = self.view(self.factory.get("/api/notable-humans-geojson/"))
+
+        assert response.status_code == 404, f"Expected 404, got {response.status_code}"
+
+
+class NotableHumansGeoJSONSeqViewSetTests(TestCase):
+    def test_returns_text_sequence(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            geojson_dir = Path(tmp_dir) / "notablehumans" / "data_collection" / "management"
+            geojson_dir.mkdir(parents=True)
+            geojson_seq = b'\x1e{"type":"Feature","id":"Q1"}\n\x1e{"type":"Feature","id":"Q2"}\n'
+            (geojson_dir / "notable_humans.geojsons").write_bytes(geojson_seq)
+
+            view = NotableHumansGeoJSONSeqViewSet.as_view({"get": "list"})
+            with override_settings(BASE_DIR=tmp_dir):
+                response = view(APIRequestFactory().get("/api/notable-humans-geojson-seq/"))
+                content = b"".join(response.streaming_content)
+
+        assert response["Content-Type"] == "application/geo+json-seq", (
+            f"Expected application/geo+json-seq, got {response['Content-Type']}"
+        )
+        assert content == geojson_seq, f"Expected the exported sequence, got {content!r}"
@@ -0,0 +1,63 @@
+from datetime import date
+
+import orjson
+from django.test import TestCase
+from django.utils.timezone import now
+
+from notablehumans.data_collection.management.commands.export_notablehumans import export_shard
+from notablehumans.data_collection.management.commands.export_notablehumans import get_shard_bounds
+from notablehumans.data_collection.models import AttributeType
+from notablehumans.data_collection.models import NotableHuman
+from notablehumans.data_collection.models import NotableHumanAttribute
+from notablehumans.data_collection.models import Place
+
+
+class ExportNotableHumansTests(TestCase):
+    def setUp(self):
+        ulm = Place.objects.create(wikidata_id="Q3012", name="Ulm", latitude=48.398, longitude=9.991)
+        princeton = Place.objects.create(wikidata_id="Q138518", name="Princeton", latitude=40.35, longitude=-74.66)
+        nowhere = Place.objects.create(wikidata_id="Q1", name="Nowhere")
+
+        einstein = NotableHuman.objects.create(
+            wikidata_id="Q937",
+            name="Albert Einstein",
+            birth_date=date(1879, 3, 14),
+            birth_place=ulm,
+            death_place=princeton,
+            last_wikidata_update=now(),
+        )
+        einstein.attributes.add(
+            NotableHumanAttribute.objects.create(wikidata_id="Q6581097", label="male", category=AttributeType.GENDER),
+            NotableHumanAttribute.objects.create(
+                wikidata_id="Q169470", label="physicist", category=AttributeType.OCCUPATION
+            ),
+        )
+        NotableHuman.objects.create(
+            wikidata_id="Q2",
+            name="No Coordinates",
+            birth_date=date(1900, 1, 1),
+            birth_place=nowhere,
+            last_wikidata_update=now(),
+        )
+
+    def test_shard_bounds_only_cover_located_humans(self):
+        bounds = get_shard_bounds()
+        assert bounds == [("Q937", "Q937")], f"Expected a single shard for Q937, got {bounds}"
+
+    def test_export_shard_builds_abbreviated_features(self):
+        features, humans_read = export_shard(("Q937", "Q937"))
+
+        assert humans_read == 1, f"Expected 1 human read, got {humans_read}"
+        feature = orjson.loads(features[0])
+        assert feature["id"] == "Q937", f"Expected feature id Q937, got {feature['id']}"
+        assert feature["geometry"]["coordinates"] == [9.991, 48.398], (
+            f"Expected rounded [lon, lat], got {feature['geometry']['coordinates']}"
+        )
+        properties = feature["properties"]
+        assert properties["n"] == "Albert Einstein", f"Expected name 'Albert Einstein', got {properties.get('n')}"
+        assert properties["bd"] == "1879-03-14", f"Expected birth date '1879-03-14', got {properties.get('bd')}"
+        assert properties["bp"] == "Ulm", f"Expected birth place 'Ulm', got {properties.get('bp')}"
+        assert properties["dp"] == "Princeton", f"Expected death place 'Princeton', got {properties.get('dp')}"
+        assert properties["g"] == ["male"], f"Expected gender ['male'], got {properties.get('g')}"
+        assert properties["o"] == ["physicist"], f"Expected occupation ['physicist'], got {properties.get('o')}"
+        assert "dy" not in properties, "Expected no death year for a human without a death date"
@@ -1,12 +1,14 @@
 from datetime import date
 
 from django.core.exceptions import ValidationError
+from django.test import TestCase
 from django.utils.timezone import now
 
 from notablehumans.data_collection.models import AttributeType
 from notablehumans.data_collection.models import NotableHuman
 from notablehumans.data_collection.models import NotableHumanAttribute
 from notablehumans.data_collection.models import Place
+from notablehumans.data_collection.models import get_article_uri
 
 
 # Test for required fields: wikidata_id is required.
@@ -158,3 +160,153 @@ def test_unique_wikidata_id():
         pass
     else:
         raise AssertionError("Expected an exception for duplicate wikidata_id, but none was raised.")
+
+
+# Test that Place.parse_and_update only returns places that need writing
+def test_place_parse_and_update_splits_new_and_changed():
+    """Test that new places are returned for creation and changed ones for a bulk update"""
+    existing = Place(wikidata_id="Q64", name="Old Berlin", latitude=52.52, longitude=13.405)
+    result = {
+        "birthPlaceID": "Q64",
+        "birthPlaceLabel": "Berlin",
+        "birthPlaceCoordinates": "Point(13.405 52.52)",
+        "deathPlaceID": "Q90",
+        "deathPlaceLabel": "Paris",
+        "deathPlaceCoordinates": "Point(2.352 48.857)",
+    }
+
+    to_create, to_update = Place.parse_and_update(result, set(), {"Q64": existing})
+
+    assert list(to_create) == ["Q90"], f"Expected only Q90 to be created, got {list(to_create)}"
+    assert to_create["Q90"].latitude == 48.857, f"Expected latitude 48.857, got {to_create['Q90'].latitude}"
+    assert to_update == {"Q64": existing}, f"Expected Q64 to be updated, got {to_update}"
+    assert existing.name == "Berlin", f"Expected the existing place to be renamed, got '{existing.name}'"
+
+
+class PlaceBulkUpsertTests(TestCase):
+    def test_bulk_upsert_creates_and_updates(self):
+        """Test that bulk_upsert inserts new places and rewrites changed ones"""
+        Place.objects.create(wikidata_id="Q64", name="Old Berlin", latitude=52.52, longitude=13.405)
+
+        Place.objects.bulk_upsert(
+            [
+                Place(wikidata_id="Q64", name="Berlin", latitude=52.52, longitude=13.405),
+                Place(wikidata_id="Q90", name="Paris", latitude=48.857, longitude=2.352),
+            ]
+        )
+
+        names = dict(Place.objects.values_list("wikidata_id", "name"))
+        assert names == {"Q64": "Berlin", "Q90": "Paris"}, f"Expected Berlin and Paris, got {names}"
+
+
+class NotableHumanAttributeBulkUpsertTests(TestCase):
+    def test_bulk_upsert_creates_and_updates(self):
+        """Test that bulk_upsert inserts new attributes and relabels existing ones"""
+        NotableHumanAttribute.objects.create(
+            wikidata_id="Q169470", label="physicist?", category=AttributeType.OCCUPATION
+        )
+
+        NotableHumanAttribute.objects.bulk_upsert(
+            [
+                NotableHumanAttribute(wikidata_id="Q169470", label="physicist", category=AttributeType.OCCUPATION),
+                NotableHumanAttribute(wikidata_id="Q6581097", label="male", category=AttributeType.GENDER),
+            ]
+        )
+
+        labels = dict(NotableHumanAttribute.objects.values_list("wikidata_id", "label"))
+        assert labels == {"Q169470": "physicist", "Q6581097": "male"}, f"Expected both labels, got {labels}"
+
+
+# Test coordinate parsing from Wikidata WKT points
+def test_parse_coordinates():
+    """Test that WKT points are parsed into (latitude, longitude) and URLs are ignored"""
+    assert Place.parse_coordinates("Point(13.405 52.52)") == (52.52, 13.405)
+    assert Place.parse_coordinates("<http://www.wikidata.org/entity/Q405> Point(-3.5 26.1)") == (26.1, -3.5)
+    assert Place.parse_coordinates("http://www.wikidata.org/.well-known/genid/abc") == (None, None)
+    assert Place.parse_coordinates(None) == (None, None)
+
+
+class NotableHumanBulkSetAttributesTests(TestCase):
+    def test_bulk_set_attributes_replaces_stale_links(self):
+        """Test that attributes are resynced in bulk, dropping links that are no longer wanted"""
+        human = NotableHuman.objects.create(wikidata_id="Q937", last_wikidata_update=now())
+        male = NotableHumanAttribute.objects.create(
+            wikidata_id="Q6581097", label="male", category=AttributeType.GENDER
+        )
+        physicist = NotableHumanAttribute.objects.create(
+            wikidata_id="Q169470", label="physicist", category=AttributeType.OCCUPATION
+        )
+        NotableHumanAttribute.objects.create(wikidata_id="Q901", label="scientist", category=AttributeType.OCCUPATION)
+        human.attributes.add(male, physicist)
+
+        NotableHuman.bulk_set_attributes({"Q937": ["Q6581097", "Q901"]})
+
+        linked = set(human.attributes.values_list("wikidata_id", flat=True))
+        assert linked == {"Q6581097", "Q901"}, f"Expected physicist replaced by scientist, got {linked}"
+
+
+# Test parsing of SPARQL date strings
+def test_parse_date():
+    """Test that SPARQL dates parse into (date, is_bc) and URLs/empty values are ignored"""
+    assert NotableHuman.parse_date("1879-03-14T00:00:00Z", None) == (date(1879, 3, 14), False)
+    assert NotableHuman.parse_date(None, "-0100-07-12T00:00:00Z") == (date(100, 7, 12), True)
+    assert NotableHuman.parse_date("http://www.wikidata.org/.well-known/genid/abc", None) == (None, False)
+    assert NotableHuman.parse_date(None, None) == (None, False)
+    assert NotableHuman.parse_date("0000-01-01T00:00:00Z|1900-02-30T00:00:00Z", "1900-02-28T00:00:00Z") == (
+        date(1900, 2, 28),
+        False,
+    )
+
+
+def test_get_article_uri():
+    """Test that article titles become quoted English Wikipedia IRIs"""
+    assert get_article_uri("Marie Curie") == "<https://en.wikipedia.org/wiki/Marie_Curie>"
+    assert get_article_uri("Gödel's theorem") == "<https://en.wikipedia.org/wiki/G%C3%B6del%27s_theorem>"
+
+
+class NotableHumanWithAttrsByCategoryTests(TestCase):
+    def test_genders_and_occupations_use_prefetched_attributes(self):
+        """Test that get_genders/get_occupations issue no queries once attributes are prefetched"""
+        human = NotableHuman.objects.create(wikidata_id="Q7186", name="Marie Curie", last_wikidata_update=now())
+        human.attributes.add(
+            NotableHumanAttribute.objects.create(
+                wikidata_id="Q6581072", label="female", category=AttributeType.GENDER
+            ),
+            NotableHumanAttribute.objects.create(
+                wikidata_id="Q169470", label="physicist", category=AttributeType.OCCUPATION
+            ),
+        )
+
+        with self.assertNumQueries(2):
+            humans = list(NotableHuman.objects.with_attrs_by_category())
+        with self.assertNumQueries(0):
+            genders = [attribute.label for attribute in humans[0].get_genders()]
+            occupations = [attribute.label for attribute in humans[0].get_occupations()]
+
+        assert genders == ["female"], f"Expected ['female'], got {genders}"
+        assert occupations == ["physicist"], f"Expected ['physicist'], got {occupations}"
+
+
+def test_get_sparql_query_requests_every_attribute_at_once():
+    """Test that one query covers every attribute category, each scoped to the batch's articles"""
+    query = NotableHuman.get_sparql_query(["Marie Curie"])
+
+    for category in AttributeType.values:
+        assert f"AS ?{category})" in query, f"Expected the query to aggregate ?{category}"
+    assert query.count("<https://en.wikipedia.org/wiki/Marie_Curie>") == 1, "Expected the article bound only once"
+    expected_scopes = len(AttributeType.values) + 1
+    assert query.count("INCLUDE %items") == expected_scopes, (
+        "Expected the main query and every attribute subquery to include the batch's items"
+    )
+
+
+def test_get_sparql_query_binds_known_items_directly():
+    """Test that titles with a known item skip the schema:about lookup while the rest still go through it"""
+    query = NotableHuman.get_sparql_query(["Marie Curie", "Albert Einstein"], {"Albert Einstein": "Q937"})
+
+    assert "(wd:Q937 <https://en.wikipedia.org/wiki/Albert_Einstein>) } ?article schema:about ?item." in query, (
+        "Expected Q937 bound to its article and still checked against schema:about"
+    )
+    assert "VALUES ?article { <https://en.wikipedia.org/wiki/Marie_Curie> }" in query, (
+        "Expected only the unknown title in the schema:about lookup"
+    )
@@ -1,5 +1,6 @@
 from datetime import datetime
 from datetime import timedelta
+from unittest.mock import MagicMock
 from unittest.mock import patch
 
 from django.test import TestCase
@@ -7,8 +8,14 @@ from django.utils.timezone import get_default_timezone
 from django.utils.timezone import make_aware
 from django.utils.timezone import now
 
+from notablehumans.data_collection.models import AttributeType
 from notablehumans.data_collection.models import NotableHuman
+from notablehumans.data_collection.models import NotableHumanAttribute
+from notablehumans.data_collection.models import Place
 from notablehumans.data_collection.tasks import fetch_wikipedia_metadata
+from notablehumans.data_collection.tasks import filter_human_titles
+from notablehumans.data_collection.tasks import get_human_details
+from notablehumans.data_collection.tasks import is_probably_human
 from notablehumans.data_collection.tasks import schedule_wikipedia_data_collection
 
 
@@ -70,13 +77,14 @@ class WikipediaDataCollectionTests(TestCase):
 
 
 class FetchWikipediaMetadataTests(TestCase):
-    @patch("notablehumans.data_collection.tasks.requests.get")
+    @patch("notablehumans.data_collection.tasks.session.get")
     def test_fetch_wikipedia_metadata(self, mock_get):
         # Mock the response from Wikipedia
         mock_response = mock_get.return_value
         mock_response.status_code = 200
-        mock_response.text = (
-            "<html><body><tr id='mw-pageinfo-length'><td>Page Length</td><td>1000</td></tr></body></html>"
+        mock_response.content = (
+            b"<html><body><table><tr id='mw-pageinfo-length'><td>Page Length</td><td>1,000</td></tr></table>"
+            b"</body></html>"
         )
 
         # Test the metadata fetching
@@ -87,3 +95,173 @@ class FetchWikipediaMetadataTests(TestCase):
         assert metadata["page_length"] == 1000, (
             f"Expected metadata['page_length'] to be 1000 but got {metadata['page_length']}"
         )
+
+    @patch("notablehumans.data_collection.tasks.session.get")
+    def test_fetch_wikipedia_metadata_follows_redirects(self, mock_get):
+        redirect = MagicMock()
+        redirect.status_code = 200
+        redirect.content = (
+            b"<html><body><table><tr id='mw-pageinfo-redirectsto'><td>Redirects to</td>"
+            b"<td><a href='/wiki/Some_Human'>Some Human</a></td></tr></table></body></html>"
+        )
+        target = MagicMock()
+        target.status_code = 200
+        target.content = (
+            b"<html><body><table><tr id='mw-pageinfo-length'><td>Page Length</td><td>1000</td></tr></table>"
+            b"</body></html>"
+        )
+        mock_get.side_effect = [redirect, target]
+
+        page_title, metadata = fetch_wikipedia_metadata("Some_Redirect")
+
+        assert mock_get.call_count == 2, f"Expected one request per hop, got {mock_get.call_count}"
+        assert page_title == "Some_Human", f"Expected the redirect target 'Some_Human', got {page_title}"
+        assert metadata["page_length"] == 1000, f"Expected the target's page length, got {metadata.get('page_length')}"
+
+
+class IsProbablyHumanTests(TestCase):
+    def test_is_probably_human(self):
+        for title in ("Albert Einstein", "Louis XIV (1638-1715)"):
+            assert is_probably_human(title), f"Expected {title!r} to look like a human"
+        for title in ("1879", "Apollo 11", "Category:Physicists", "List of physicists", "Template talk:Infobox"):
+            assert not is_probably_human(title), f"Expected {title!r} to be rejected"
+
+    def test_filter_human_titles(self):
+        titles = ["Albert Einstein", "1879", "1879 (film)", "Portal:Physics", "Apollo 11 "]
+        humans = filter_human_titles(titles)
+        assert humans == ["Albert Einstein", "1879 (film)"], f"Expected only human-looking titles, got {humans}"
+
+
+class GetHumanDetailsTests(TestCase):
+    def setUp(self):
+        a_day_ago = now() - timedelta(days=1)
+        Place.objects.create(
+            wikidata_id="Q3012", name="Ulm an der Donau", latitude=48.4, longitude=10.0, last_updated=a_day_ago
+        )
+        male = NotableHumanAttribute.objects.create(
+            wikidata_id="Q6581097", label="man", category=AttributeType.GENDER, last_updated=a_day_ago
+        )
+        violinist = NotableHumanAttribute.objects.create(
+            wikidata_id="Q1259917", label="violinist", category=AttributeType.OCCUPATION, last_updated=a_day_ago
+        )
+        einstein = NotableHuman.objects.create(
+            wikidata_id="Q937",
+            name="Einstein",
+            wikipedia_url="Albert_Einstein",
+            last_wikidata_update=now() - timedelta(days=30),
+        )
+        einstein.attributes.add(male, violinist)
+        # Written by another batch a moment ago, so this batch leaves it alone
+        NotableHuman.objects.create(
+            wikidata_id="Q1",
+            name="Recently Updated",
+            wikipedia_url="Recently_Updated",
+            last_wikidata_update=now() - timedelta(seconds=90),
+        )
+
+        entity = "http://www.wikidata.org/entity/"
+        article = "https://en.wikipedia.org/wiki/"
+        self.rows = [
+            {
+                "item": f"{entity}Q937",
+                "itemLabel": "Albert Einstein",
+                "article": f"{article}Albert_Einstein",
+                "dobValues": "1879-03-14T00:00:00Z",
+                "birthPlaceLabel": "Ulm",
+                "birthPlaceID": "Q3012",
+                "birthPlaceCoordinates": "Point(9.991 48.398)",
+                "gender": "Q6581097||male",
+                "occupation": "Q169470||physicist",
+            },
+            {
+                "item": f"{entity}Q7186",
+                "itemLabel": "Marie Curie",
+                "article": f"{article}Marie_Curie",
+                "dobValues": "1867-11-07T00:00:00Z",
+                "birthPlaceLabel": "Warsaw",
+                "birthPlaceID": "Q270",
+                "birthPlaceCoordinates": "Point(21.011 52.23)",
+                "gender": "Q6581072||female",
+                "occupation": "Q169470||physicist",
+            },
+            {"item": f"{entity}Q1", "itemLabel": "Changed Name", "article": f"{article}Recently_Updated"},
+        ]
+
+    @patch("notablehumans.data_collection.tasks.time.sleep")
+    @patch("notablehumans.data_collection.tasks.RELEASE_BATCH_SCRIPT", return_value=0)
+    @patch("notablehumans.data_collection.tasks.REDIS_CLIENT")
+    @patch("notablehumans.data_collection.tasks.get_sparql_rows")
+    def test_get_human_details_writes_batch(self, mock_get_sparql_rows, mock_redis, mock_release, mock_sleep):
+        mock_get_sparql_rows.return_value = self.rows
+
+        get_human_details(["Albert Einstein", "Marie Curie", "Recently Updated"], "1700000000")
+
+        curie = NotableHuman.objects.get(wikidata_id="Q7186")
+        assert curie.name == "Marie Curie", f"Expected the new human to be created, got {curie.name}"
+        assert curie.birth_year == 1867, f"Expected set_years() to fill birth_year 1867, got {curie.birth_year}"
+        assert curie.birth_place_id == "Q270", f"Expected Warsaw as birth place, got {curie.birth_place_id}"
+        curie_attributes = set(curie.attributes.values_list("wikidata_id", flat=True))
+        assert curie_attributes == {"Q6581072", "Q169470"}, f"Expected female and physicist, got {curie_attributes}"
+
+        einstein = NotableHuman.objects.get(wikidata_id="Q937")
+        assert einstein.name == "Albert Einstein", f"Expected the existing human to be updated, got {einstein.name}"
+        assert einstein.birth_year == 1879, f"Expected birth_year 1879, got {einstein.birth_year}"
+        assert einstein.birth_place_id == "Q3012", f"Expected Ulm as birth place, got {einstein.birth_place_id}"
+        einstein_attributes = set(einstein.attributes.values_list("wikidata_id", flat=True))
+        assert einstein_attributes == {"Q6581097", "Q169470"}, (
+            f"Expected the stale violinist link replaced by physicist, got {einstein_attributes}"
+        )
+
+        ulm = Place.objects.get(wikidata_id="Q3012")
+        assert ulm.name == "Ulm", f"Expected the existing place to be renamed, got {ulm.name}"
+        warsaw = Place.objects.get(wikidata_id="Q270")
+        assert (warsaw.latitude, warsaw.longitude) == (52.23, 21.011), (
+            f"Expected the new place's coordinates, got {(warsaw.latitude, warsaw.longitude)}"
+        )
+        male = NotableHumanAttribute.objects.get(wikidata_id="Q6581097")
+        assert male.label == "male", f"Expected the existing attribute to be relabeled, got {male.label}"
+        female = NotableHumanAttribute.objects.get(wikidata_id="Q6581072")
+        assert female.category == AttributeType.GENDER, f"Expected a new gender attribute, got {female.category}"
+
+        recent = NotableHuman.objects.get(wikidata_id="Q1")
+        assert recent.name == "Recently Updated", f"Expected the recent human to be skipped, got {recent.name}"
+        mock_release.assert_called_once()
+
+    @patch("notablehumans.data_collection.tasks.time.sleep")
+    @patch("notablehumans.data_collection.tasks.RELEASE_BATCH_SCRIPT", return_value=0)
+    @patch("notablehumans.data_collection.tasks.REDIS_CLIENT")
+    @patch("notablehumans.data_collection.tasks.get_sparql_rows")
+    def test_get_human_details_requeries_stale_known_item(
+        self, mock_get_sparql_rows, mock_redis, mock_release, mock_sleep
+    ):
+        """Test that a known item returning no row (e.g. merged away) is looked up again by its article"""
+        merged_row = {**self.rows[0], "item": "http://www.wikidata.org/entity/Q99999"}
+        mock_get_sparql_rows.side_effect = [[], [merged_row]]
+
+        get_human_details(["Albert Einstein"], "1700000000")
+
+        assert mock_get_sparql_rows.call_count == 2, f"Expected a second query, got {mock_get_sparql_rows.call_count}"
+        requery = mock_get_sparql_rows.call_args_list[1].args[0]
+        assert "VALUES ?article { <https://en.wikipedia.org/wiki/Albert_Einstein> }" in requery, (
+            "Expected the stale title looked up again through schema:about"
+        )
+        assert "wd:Q937" not in requery, "Expected the stale item left out of the second query"
+        merged = NotableHuman.objects.get(wikidata_id="Q99999")
+        assert merged.wikipedia_url == "Albert_Einstein", f"Expected the new item stored, got {merged.wikipedia_url}"
+
+    @patch("notablehumans.data_collection.tasks.time.sleep")
+    @patch("notablehumans.data_collection.tasks.RELEASE_BATCH_SCRIPT", return_value=0)
+    @patch("notablehumans.data_collection.tasks.REDIS_CLIENT")
+    @patch("notablehumans.data_collection.tasks.get_sparql_rows")
+    def test_get_human_details_never_marks_stored_human_as_non_human(
+        self, mock_get_sparql_rows, mock_redis, mock_release, mock_sleep
+    ):
+        """Test that only titles without a stored human go into the non-human set when no row comes back"""
+        mock_get_sparql_rows.return_value = []
+
+        get_human_details(["Albert Einstein", "Mount Everest"], "1700000000")
+
+        zadd = mock_redis.pipeline.return_value.zadd
+        zadd.assert_called_once()
+        non_human_titles = set(zadd.call_args.args[1])
+        assert non_human_titles == {"Mount Everest"}, f"Expected only the unknown title, got {non_human_titles}"